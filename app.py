@@ -1,11 +1,20 @@
 from flask import Flask, request, jsonify
 from twilio.twiml.voice_response import VoiceResponse, Gather
-from twilio.rest import Client
+from twilio.request_validator import RequestValidator
 import os
+import re
+import atexit
+import hashlib
+import logging
+from threading import Thread
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from config import Config
+
 # Import all services
 from services.booking_service import BookingService
 from services.pricing_service import PricingService
@@ -15,9 +24,16 @@ from services.email_service import EmailService
 from services.distance_service import DistanceService
 from services.validation_service import ValidationService
 from services.ai_service import AIService
+from services.session_store import SessionStore
+from services.twilio_client import get_twilio_client
+from services.batch_writer import BatchWriter
 from utils.logger import setup_logger
+from utils import twiml
+from utils.call_futures import CallFutures
+from utils.json_provider import OrjsonProvider
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 logger = setup_logger()
 
 # Initialize services
@@ -29,23 +45,66 @@ email_service = EmailService()
 distance_service = DistanceService()
 validation_service = ValidationService()
 ai_service = AIService()
+session_store = SessionStore()
 
-# Twilio client
-twilio_client = Client(
-    os.getenv('TWILIO_ACCOUNT_SID'),
-    os.getenv('TWILIO_AUTH_TOKEN')
-)
+# Twilio client (shared with SMSService; one pooled HTTPS session per process)
+twilio_client = get_twilio_client()
+
+def warm_up_clients():
+    """Open OpenAI/Twilio connections in the background before the first caller needs them.
 
-# Session storage (in production, use Redis or database)
-call_sessions = {}
+    Called per process (gunicorn post_worker_init or __main__) so sockets
+    are never shared across a fork.
+    """
+    def _warm():
+        ai_service.warm_up()
+        try:
+            twilio_client.api.v2010.accounts(twilio_client.account_sid).fetch()
+        except Exception as e:
+            logger.warning(f"Error warming up Twilio client: {e}")
+        logger.info("Warmed up OpenAI and Twilio connections")
+    Thread(target=_warm, daemon=True, name='warm-up').start()
 
 # Import handlers modules (not specific functions to avoid circular imports)
 import handlers.conversation_handlers as conv_handlers
 import handlers.estimate_handlers as est_handlers
+from handlers.context import Ctx
 
-# Share the call_sessions dictionary with handlers
-conv_handlers.call_sessions = call_sessions
-est_handlers.call_sessions = call_sessions
+# Reject webhooks Twilio didn't sign before any session or TwiML work
+_twilio_validator = None
+if Config.VALIDATE_TWILIO_SIGNATURE:
+    if Config.TWILIO_AUTH_TOKEN:
+        _twilio_validator = RequestValidator(Config.TWILIO_AUTH_TOKEN)
+    else:
+        logger.warning("VALIDATE_TWILIO_SIGNATURE is set but TWILIO_AUTH_TOKEN is missing; not validating")
+
+def _signed_url():
+    """The URL Twilio signed: PUBLIC_BASE_URL + path, else the request URL with the forwarded scheme"""
+    if PUBLIC_BASE_URL:
+        query = request.query_string.decode()
+        return f"{PUBLIC_BASE_URL}{request.path}?{query}" if query else f"{PUBLIC_BASE_URL}{request.path}"
+    proto = request.headers.get('X-Forwarded-Proto')
+    if proto and proto != request.scheme:
+        return request.url.replace(f"{request.scheme}://", f"{proto}://", 1)
+    return request.url
+
+@app.before_request
+def _validate_twilio_signature():
+    if _twilio_validator is None or not request.path.startswith(('/voice/', '/sms/')):
+        return None
+    params = request.form if request.method == 'POST' else {}
+    if not _twilio_validator.validate(_signed_url(), params, request.headers.get('X-Twilio-Signature', '')):
+        logger.warning(f"Rejected unsigned request to {request.path}")
+        return '', 403
+    return None
+
+@app.teardown_request
+def _flush_call_sessions(exc):
+    """Persist sessions mutated during this webhook (one Redis round-trip)"""
+    try:
+        session_store.flush()
+    except Exception as e:
+        logger.error(f"Error flushing call sessions: {e}", exc_info=True)
 
 # --------------------------
 # Twilio Speech configuration helper
@@ -58,6 +117,40 @@ DEFAULT_HINTS = os.getenv(
     'local,long distance,junk removal,in-home service,house,apartment,office,warehouse,yes,no,'
     'morning,afternoon,evening,flexible,one,two,three,four,five,six,seven,eight,nine,zero,oh,o,zip,zip code,from,to'
 )
+# Narrower hints for number entry (phone, ZIP): fewer alternatives for the recognizer
+DIGIT_HINTS = os.getenv(
+    'TWILIO_DIGIT_HINTS',
+    'zero,oh,one,two,three,four,five,six,seven,eight,nine,plus,zip,zip code'
+)
+_STEP_HINTS = {
+    'collect_phone': DIGIT_HINTS,
+    'collect_pickup_address': DIGIT_HINTS,
+    'collect_dropoff_address': DIGIT_HINTS,
+}
+
+def _dial_manager_twiml(message):
+    """Render Say(message) + Dial(manager) once; these replies never vary per call"""
+    response = VoiceResponse()
+    response.say(message, voice='Polly.Joanna')
+    response.dial(Config.MANAGER_PHONE)
+    return twiml.static_xml(response)
+
+# Transfer replies, serialized at import
+_DTMF0_XML = _dial_manager_twiml("Connecting you to our manager now. Please hold.")
+_TRANSFER_XML = _dial_manager_twiml("Transferring you now. Please hold.")
+_TRANSFER_READY_XML = _dial_manager_twiml("Thank you. I have your details. I'll transfer you now.")
+_TRANSFER_CONFIRMED_XML = _dial_manager_twiml("I'll transfer you to our manager right away. Please hold.")
+
+# Public base URL for absolute Twilio URLs; when unset it is derived per request
+PUBLIC_BASE_URL = os.getenv('PUBLIC_BASE_URL', '').rstrip('/')
+CHECK_AVAILABILITY2_URL = f"{PUBLIC_BASE_URL}/voice/check_availability2" if PUBLIC_BASE_URL else None
+
+def _base_url():
+    """Base URL for Twilio callbacks (PUBLIC_BASE_URL, else the request's root)"""
+    if PUBLIC_BASE_URL:
+        return PUBLIC_BASE_URL
+    # Use HTTP for ngrok free tier (HTTPS has issues)
+    return request.url_root.rstrip('/').replace('https://', 'http://')
 
 def _make_gather(
     input_types='speech dtmf',
@@ -68,6 +161,7 @@ def _make_gather(
     num_digits=None,
     action_on_empty=True,
     finish_on_key='0',
+    hints=DEFAULT_HINTS,
 ):
     """Create a Twilio Gather with enhanced ASR and domain hints."""
     kwargs = dict(
@@ -79,7 +173,7 @@ def _make_gather(
         language=SPEECH_LANGUAGE,
         enhanced=SPEECH_ENHANCED,
         speech_model=SPEECH_MODEL,
-        hints=DEFAULT_HINTS,
+        hints=hints,
         actionOnEmptyResult=action_on_empty
     )
     if num_digits is not None:
@@ -88,35 +182,104 @@ def _make_gather(
         kwargs['finishOnKey'] = finish_on_key
     return Gather(**kwargs)
 
+# Rendered <Gather> XML per parameter tuple; turns only differ by the prompt text
+_GATHER_XML = {}
+
+def _gather_twiml(
+    response,
+    message,
+    input_types='speech dtmf',
+    action='/voice/process',
+    method='POST',
+    timeout=4,
+    speech_timeout='auto',
+    num_digits=None,
+    action_on_empty=True,
+    finish_on_key='0',
+    hints=DEFAULT_HINTS,
+):
+    """Append Gather(Say(message)) to the response from a cached template and return TwiML.
+
+    The hints attribute (the longest part of every Gather) is escaped once per template.
+    """
+    key = (input_types, action, method, timeout, speech_timeout, num_digits, action_on_empty, finish_on_key, hints)
+    template = _GATHER_XML.get(key)
+    if template is None:
+        template = _GATHER_XML[key] = twiml.gather_template(_make_gather(*key))
+    return twiml.append_xml(response, twiml.fill_gather(template, message))
+
+# Pre-render the parameter sets used on every call
+for _opts in (
+    dict(timeout=4),
+    dict(timeout=5),
+    dict(timeout=5, num_digits=14, hints=DIGIT_HINTS),
+    dict(timeout=5, hints=DIGIT_HINTS),
+    dict(input_types='speech', timeout=5),
+):
+    _gather_twiml(VoiceResponse(), '', **_opts)
+
 # --------------------------
 # Transfer helper utilities
 # --------------------------
 # Do NOT require email before transfer (email collection removed by request)
 REQUIRED_FOR_TRANSFER = ['name', 'phone']
 
+# Phrases that signal the caller wants a human, matched in a single regex pass
+TRANSFER_PHRASES = [
+    'transfer me', 'transfer now', 'talk to manager', 'talk to a manager',
+    'speak to manager', 'speak to a manager', 'speak to someone', 'talk to someone',
+    'operator', 'human', 'representative', 'agent', 'manager'
+]
+_TRANSFER_RE = re.compile('|'.join(map(re.escape, TRANSFER_PHRASES)))
+
+def _render_transfer_prompt_xml():
+    response = VoiceResponse()
+    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
+    gather.say("Would you like me to transfer you to our manager now?", voice='Polly.Joanna')
+    response.append(gather)
+    # Fallback on silence
+    response.say("I didn't catch that. Should I transfer you to our manager?", voice='Polly.Joanna')
+    response.redirect('/voice/process', method='POST')
+    return twiml.static_xml(response)
+
+# "Transfer me" heard mid-flow: confirm first (static, rendered once)
+_TRANSFER_PROMPT_XML = _render_transfer_prompt_xml()
+
+def _render_transfer_ask_again_xml():
+    response = VoiceResponse()
+    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
+    gather.say("Sorry, would you like me to transfer you to our manager now?", voice='Polly.Joanna')
+    response.append(gather)
+    return twiml.static_xml(response)
+
+# Unclear answer to the transfer prompt (static, rendered once)
+_TRANSFER_ASK_AGAIN_XML = _render_transfer_ask_again_xml()
+
+# Name fallback cleanup: strip lead-ins, then anything that isn't a letter
+_NAME_LEAD_IN_RE = re.compile(r"\b(?:my name is|this is|i am|i'm|it's|its|name is)\b")
+_NAME_KEEP_RE = re.compile(r"[^a-z\s]+")
+
 def _normalize_phone_in_session(session):
     """Ensure data.phone is set from top-level session phone if missing"""
     data = session.setdefault('data', {})
     if not data.get('phone') and session.get('phone'):
         data['phone'] = session.get('phone')
+    return data
 
 def _missing_fields_for_transfer(session):
-    data = session.get('data', {})
-    _normalize_phone_in_session(session)
-    missing = []
-    for key in REQUIRED_FOR_TRANSFER:
-        val = data.get(key)
-        if not val:
-            missing.append(key)
-    return missing
+    data = _normalize_phone_in_session(session)
+    return [key for key in REQUIRED_FOR_TRANSFER if not data.get(key)]
+
+# Field still needed for a transfer -> step that collects it
+_FIELD_STEPS = {
+    'name': 'collect_name',
+    'phone': 'collect_phone',
+    'pickup_address': 'collect_pickup_address',
+    'dropoff_address': 'collect_dropoff_address'
+}
 
 def _step_for_field(field_key):
-    return {
-        'name': 'collect_name',
-        'phone': 'collect_phone',
-        'pickup_address': 'collect_pickup_address',
-        'dropoff_address': 'collect_dropoff_address'
-    }.get(field_key)
+    return _FIELD_STEPS.get(field_key)
 
 def _prompt_for_step(step, response, name_hint=None):
     """Append a gather prompt appropriate for the step and return TwiML string."""
@@ -127,13 +290,56 @@ def _prompt_for_step(step, response, name_hint=None):
         'collect_dropoff_address': "What's the drop-off ZIP code? You can say it digit by digit."
     }
     msg = prompts.get(step, "Let's continue.")
-    gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', finish_on_key='0')
-    gather.say(msg, voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_twiml(response, msg, input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', finish_on_key='0', hints=_STEP_HINTS.get(step, DEFAULT_HINTS))
+
+# Twilio REST / SMS / call-log work triggered by a webhook runs here, so the
+# webhook (or the lead form) gets its answer without waiting on those APIs.
+_NOTIFY_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='notify')
+atexit.register(_NOTIFY_EXECUTOR.shutdown, wait=True)
+
+def _clean_lead_data(data):
+    """Strip stray quotes/whitespace from string values"""
+    cleaned_data = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            # Remove extra quotes from strings
+            cleaned_value = value.strip().strip("'\"")
+            cleaned_data[key] = cleaned_value
+        else:
+            cleaned_data[key] = value
+    return cleaned_data
+
+def _save_partial_leads(batch):
+    """Clean and persist a batch of (call_sid, data, saved_at) snapshots in one append"""
+    try:
+        booking_service.save_partial_leads([
+            (call_sid, _clean_lead_data(data), saved_at) for call_sid, data, saved_at in batch
+        ])
+    except Exception as e:
+        logger.error(f"Error saving partial leads: {e}", exc_info=True)
+
+# Partial-lead rows are written off the request path and batched into a
+# single sheet append (bounded; when full the oldest pending write is dropped)
+_LEAD_WRITER = BatchWriter(
+    'lead-save', _save_partial_leads,
+    batch_size=int(os.getenv('LEAD_SAVE_BATCH_SIZE', 50)),
+    wait_seconds=float(os.getenv('LEAD_SAVE_BATCH_WAIT_SECONDS', 2))
+)
+
+def _mark_transfer_pending(call_sid):
+    """Record a DTMF-0 transfer on the session (runs on the notify executor)"""
+    try:
+        with session_store.session_txn(call_sid) as session:
+            if session is None:
+                # No session stored yet: create it, or the flag would be dropped with the default
+                session = session_store.setdefault(call_sid, {'data': {}})
+            session.setdefault('data', {})
+            session['transfer_pending'] = True
+    except Exception as e:
+        logger.error(f"Error marking transfer for {call_sid}: {e}", exc_info=True)
 
 def save_session_data(call_sid, session):
-    """Save session data to prevent loss on disconnect"""
+    """Save session data to prevent loss on disconnect (non-blocking)"""
     try:
         data = session.get('data', {})
         if data:
@@ -142,346 +348,326 @@ def save_session_data(call_sid, session):
             # In production, save to database here
             # For now, we'll try to save to booking service if we have enough info
             if 'name' in data and 'phone' in data:
-                try:
-                    # Clean the data before saving
-                    cleaned_data = {}
-                    for key, value in data.items():
-                        if isinstance(value, str):
-                            # Remove extra quotes from strings
-                            cleaned_value = value.strip().strip("'\"")
-                            cleaned_data[key] = cleaned_value
-                        else:
-                            cleaned_data[key] = value
-                    
-                    booking_service.save_partial_lead(call_sid, cleaned_data)
-                except Exception as e:
-                    logger.error(f"Error saving partial lead: {e}", exc_info=True)
+                # Snapshot now (with its time); the session keeps changing after this turn
+                dropped = _LEAD_WRITER.submit((call_sid, dict(data), datetime.now()))
+                if dropped is not None:
+                    logger.warning(f"Save queue full; dropped pending partial lead for {dropped[0]}")
     except Exception as e:
         logger.error(f"Error saving session data: {e}", exc_info=True)
 
+# Inbound greetings, built once; the returning-customer one only needs the name
+_GREETING_KNOWN = (
+    "Hi {name}, thank you for calling USF Moving Company again. "
+    "If you'd like to talk to our manager, you can say that at any time. "
+    "How can I help you today?"
+)
+_GREETING_ANON = (
+    "Hi, thank you for calling USF Moving Company, your best choice for local and long distance moving, "
+    "junk removal and in-home service. If you'd like to talk to our manager, you can say that at any time. "
+    "How can I help you today?"
+)
+
+def _webhook_params():
+    """Twilio's webhook parameters: the form body on POST, the query string on GET"""
+    return request.form if request.method == 'POST' else request.args
+
 @app.route('/voice/inbound', methods=['GET', 'POST'])
+@twiml.xml_view
 def handle_inbound_call():
     """Handle incoming calls"""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    from_number = request.values.get('From')
+    call_sid = params.get('CallSid')
+    from_number = params.get('From')
     
     # Check if returning customer
     customer = booking_service.get_customer_by_phone(from_number)
     
     if customer:
         cust_name = customer.get('Name') or customer.get('name') or 'there'
-        greeting = (
-            f"Hi {cust_name}, thank you for calling USF Moving Company again. "
-            "If you'd like to talk to our manager, you can say that at any time. "
-            "How can I help you today?"
-        )
+        greeting = _GREETING_KNOWN.format_map({'name': cust_name})
     else:
-        greeting = (
-            "Hi, thank you for calling USF Moving Company, your best choice for local and long distance moving, "
-            "junk removal and in-home service. If you'd like to talk to our manager, you can say that at any time. "
-            "How can I help you today?"
-        )
+        greeting = _GREETING_ANON
     
     # Initialize session
-    call_sessions[call_sid] = {
+    session_store.set(call_sid, {
         'phone': from_number,
         'step': 'greeting',
         'data': {},
         'customer': customer
-    }
+    })
     
-    gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto', finish_on_key='0')
-    gather.say(greeting, voice='Polly.Joanna')
-    response.append(gather)
-    
-    return str(response)
+    return _gather_twiml(response, greeting, input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto', finish_on_key='0')
 
 @app.route('/voice/process', methods=['POST'])
+@twiml.xml_view
 def process_speech():
     """Process speech input and route conversation"""
-    response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
+    params = _webhook_params()
+    call_sid = params.get('CallSid')
     # Capture raw inputs from Twilio
-    raw_digits = request.values.get('Digits') or ''
-    raw_speech = request.values.get('SpeechResult') or ''
+    raw_digits = params.get('Digits') or ''
     
-    session = call_sessions.get(call_sid, {})
-    current_step = session.get('step', 'greeting')
-
-    # Immediate transfer on DTMF '0' at any time
-    if str(raw_digits).strip() == '0':
-        session.setdefault('data', {})
-        session['transfer_pending'] = True
-        response.say("Connecting you to our manager now. Please hold.", voice='Polly.Joanna')
-        response.dial(os.getenv('MANAGER_PHONE', '+18327999276'))
-        return str(response)
-
-    # Selection logic: default to speech when present, unless the step expects numeric input
-    def _select_input(step, digits, speech):
-        step_prefers_digits = step in {'collect_phone', 'collect_pickup_address', 'collect_dropoff_address'}
-        if step_prefers_digits and digits:
-            return digits  # keep digits as-is
-        # Otherwise prefer speech when available
-        if speech:
-            return speech.lower()
-        if digits:
-            return digits  # last resort
-        return ''
-
-    speech_result = _select_input(current_step, raw_digits, raw_speech)
-    logger.info(
-        f"Call {call_sid} - Step: {current_step} - RawSpeech='{raw_speech}' RawDigits='{raw_digits}' -> Used='{speech_result}'"
-    )
+    # Immediate transfer on DTMF '0' at any time: no session round trip on this path
+    if raw_digits.strip() == '0':
+        if call_sid:
+            _NOTIFY_EXECUTOR.submit(_mark_transfer_pending, call_sid)
+        return _DTMF0_XML
     
-    # Check for explicit transfer intent; confirm before proceeding
-    _sr = speech_result or ''
-    transfer_phrases = [
-        'transfer me', 'transfer now', 'talk to manager', 'talk to a manager',
-        'speak to manager', 'speak to a manager', 'speak to someone', 'talk to someone',
-        'operator', 'human', 'representative', 'agent', 'manager'
-    ]
-    if any(p in _sr for p in transfer_phrases):
-        # Ask for confirmation instead of transferring immediately
-        session['transfer_prev_step'] = current_step
-        session['step'] = 'confirm_transfer_request'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Would you like me to transfer you to our manager now?", voice='Polly.Joanna')
-        response.append(gather)
-        # Fallback on silence
-        response.say("I didn't catch that. Should I transfer you to our manager?", voice='Polly.Joanna')
-        response.redirect('/voice/process', method='POST')
-        return str(response)
+    response = VoiceResponse()
+    raw_speech = params.get('SpeechResult') or ''
     
-    # If a transfer is pending, check if all required info is gathered; if so, transfer immediately
-    if session.get('transfer_pending'):
-        missing = _missing_fields_for_transfer(session)
-        if not missing:
-            response.say("Thank you. I have your details. I'll transfer you now.", voice='Polly.Joanna')
-            response.dial('+18327999276')
-            return str(response)
-
-    # Handle conversation flow
-    if current_step == 'greeting':
-        return handle_greeting(call_sid, speech_result, response)
-    elif current_step == 'collect_name':
-        return handle_name(call_sid, speech_result, response)
-    elif current_step == 'confirm_name':
-        return handle_confirm_name(call_sid, speech_result, response)
-    elif current_step == 'collect_phone':
-        return handle_phone(call_sid, speech_result, response)
-    elif current_step == 'confirm_calling_number':
-        return handle_confirm_calling_number(call_sid, speech_result, response)
-    elif current_step == 'confirm_transfer_request':
-        return handle_confirm_transfer_request(call_sid, speech_result, response)
-    elif current_step == 'collect_email':
-        return handle_email(call_sid, speech_result, response)
-    elif current_step == 'collect_email_case':
-        return handle_email_case(call_sid, speech_result, response)
-    elif current_step == 'collect_move_type':
-        return handle_move_type(call_sid, speech_result, response)
-    elif current_step == 'collect_property_type':
-        return handle_property_type(call_sid, speech_result, response)
-    elif current_step == 'collect_pickup_type':
-        return handle_pickup_type(call_sid, speech_result, response)
-    elif current_step == 'collect_pickup_address':
-        return handle_pickup_address(call_sid, speech_result, response)
-    elif current_step == 'confirm_pickup_address':
-        return handle_confirm_pickup_address(call_sid, speech_result, response)
-    elif current_step == 'collect_pickup_rooms':
-        return handle_pickup_rooms(call_sid, speech_result, response)
-    elif current_step == 'confirm_pickup_rooms':
-        return conv_handlers.handle_confirm_pickup_rooms(call_sid, speech_result, response)
-    elif current_step == 'collect_pickup_stairs':
-        return handle_pickup_stairs(call_sid, speech_result, response)
-    elif current_step == 'collect_dropoff_type':
-        return handle_dropoff_type(call_sid, speech_result, response)
-    elif current_step == 'collect_dropoff_address':
-        return handle_dropoff_address(call_sid, speech_result, response)
-    elif current_step == 'confirm_dropoff_address':
-        return handle_confirm_dropoff_address(call_sid, speech_result, response)
-    elif current_step == 'collect_dropoff_rooms':
-        return handle_dropoff_rooms(call_sid, speech_result, response)
-    elif current_step == 'confirm_dropoff_rooms':
-        return conv_handlers.handle_confirm_dropoff_rooms(call_sid, speech_result, response)
-    elif current_step == 'collect_dropoff_stairs':
-        return handle_dropoff_stairs(call_sid, speech_result, response)
-    elif current_step == 'collect_date':
-        return handle_date(call_sid, speech_result, response)
-    elif current_step == 'collect_time':
-        twiml_response = handle_time(call_sid, speech_result, response)
-        logger.info(f"Call {call_sid} - TwiML response from handle_time (length: {len(twiml_response)}): {twiml_response[:500]}")
-        return twiml_response
-    elif current_step == 'confirm_time':
-        return handle_confirm_time(call_sid, speech_result, response)
-    elif current_step == 'collect_packing':
-        return handle_packing(call_sid, speech_result, response)
-    elif current_step == 'collect_special_items':
-        return handle_special_items(call_sid, speech_result, response)
-    elif current_step == 'collect_special_instructions':
-        return handle_special_instructions(call_sid, speech_result, response)
-    elif current_step == 'ask_process_explanation':
-        return handle_ask_process_explanation(call_sid, speech_result, response)
-    elif current_step == 'explain_process':
-        return handle_process_explanation(call_sid, speech_result, response)
-    elif current_step == 'provide_estimate':
-        return provide_estimate(call_sid, session, response)
-    elif current_step == 'confirm_booking':
-        return confirm_booking(call_sid, session, speech_result, response)
-    elif current_step == 'handle_alternative_selection':
-        return handle_alternative_selection(call_sid, session, speech_result, response)
-    elif current_step == 'handle_discount_offer':
-        return est_handlers.handle_discount_offer(call_sid, session, speech_result, response)
-    elif current_step == 'handle_inhouse_estimate':
-        return est_handlers.handle_inhouse_estimate(call_sid, session, speech_result, response)
-    elif current_step == 'collect_final_pickup_address':
-        return est_handlers.handle_final_pickup_address(call_sid, session, speech_result, response)
-    elif current_step == 'confirm_final_pickup_address':
-        return est_handlers.handle_confirm_final_pickup_address(call_sid, session, speech_result, response)
-    elif current_step == 'collect_final_dropoff_address':
-        return est_handlers.handle_final_dropoff_address(call_sid, session, speech_result, response)
-    elif current_step == 'confirm_final_dropoff_address':
-        return est_handlers.handle_confirm_final_dropoff_address(call_sid, session, speech_result, response)
-    elif current_step == 'confirm_sms_received':
-        return est_handlers.handle_confirm_sms_received(call_sid, session, speech_result, response)
-    elif current_step == 'confirm_phone_for_sms':
-        return est_handlers.handle_confirm_phone_for_sms(call_sid, session, speech_result, response)
-    elif current_step == 'collect_phone_for_sms':
-        return est_handlers.handle_collect_phone_for_sms(call_sid, session, speech_result, response)
+    # Twilio retries slow webhooks; a retry of a turn that is running or already
+    # answered gets that turn's TwiML instead of re-running the handlers.
+    # Retries carry the original request's idempotency token. Without one, identical
+    # params may be a genuine new turn (two "yes" answers in a row), so only a turn
+    # that is still running is coalesced.
+    idempotency_token = request.headers.get('I-Twilio-Idempotency-Token')
+    turn_key = idempotency_token or hashlib.sha1(repr(sorted(params.items(multi=True))).encode()).hexdigest()
+    if call_sid:
+        reply = session_store.cached_reply(call_sid, turn_key) if idempotency_token else None
+        if reply is None:
+            if not session_store.begin_turn(call_sid, turn_key):
+                # Answer well inside Twilio's 15s webhook timeout; the hold below covers longer turns
+                reply = session_store.wait_for_reply(call_sid, turn_key, timeout=5.0)
+                if reply is None:
+                    # Never run unlocked: hold and collect this turn's reply on the redirect
+                    logger.info(f"Call {call_sid} - Turn still running, holding for its reply")
+                    return _hold_for_reply(turn_key, 0)
+        if reply is not None:
+            logger.info(f"Call {call_sid} - Duplicate webhook, replaying previous TwiML")
+            return reply
     
-    logger.info(f"Call {call_sid} - No handler matched, returning empty response")
+    body = None
+    try:
+        body = _process_turn(call_sid, raw_digits, raw_speech, response)
+        return body
+    finally:
+        if call_sid:
+            session_store.end_turn(call_sid, turn_key, body)
+
+# Redirect hops (about a second each) a held duplicate waits for the running turn
+TURN_REPLY_POLLS = int(os.getenv('TURN_REPLY_POLLS', 10))
+
+def _hold_for_reply(turn_key, attempt):
+    response = VoiceResponse()
+    response.pause(length=1)
+    response.redirect(f"/voice/turn_reply?turn={turn_key}&n={attempt}", method='POST')
     return str(response)
 
+@app.route('/voice/turn_reply', methods=['POST'])
+@twiml.xml_view
+def turn_reply():
+    """Replay a held turn's TwiML once the turn that owned the call has finished"""
+    call_sid = request.form.get('CallSid')
+    turn_key = request.args.get('turn', '')
+    try:
+        attempt = int(request.args.get('n', 0))
+    except ValueError:
+        attempt = TURN_REPLY_POLLS
+    reply = session_store.cached_reply(call_sid, turn_key) if call_sid else None
+    if reply is not None:
+        return reply
+    if call_sid and attempt < TURN_REPLY_POLLS and session_store.running_turn(call_sid) is not None:
+        return _hold_for_reply(turn_key, attempt + 1)
+    # The input was never handled (another request held the call): ask for it again
+    return _gather_twiml(VoiceResponse(), "Sorry, could you say that again?")
+
+# Steps that expect numeric input: keypad digits win over speech there
+_DIGIT_STEPS = frozenset({'collect_phone', 'collect_pickup_address', 'collect_dropoff_address'})
+
+def _select_input(step, digits, speech):
+    """Pick the input to use: digits on numeric steps, else lowercased speech"""
+    if digits and step in _DIGIT_STEPS:
+        return digits  # keep digits as-is
+    # Otherwise prefer speech when available
+    if speech:
+        return speech.lower()
+    return digits  # last resort ('' when neither came through)
+
+def _process_turn(call_sid, raw_digits, raw_speech, response):
+    """Route one caller utterance to the handler for the current step"""
+    # One session load and (if changed) one write-back for the whole turn
+    with session_store.session_txn(call_sid, {}) as session:
+        current_step = session.get('step', 'greeting')
+
+        speech_result = _select_input(current_step, raw_digits, raw_speech)
+        logger.info(
+            "Call %s - Step: %s - RawSpeech='%s' RawDigits='%s' -> Used='%s'",
+            call_sid, current_step, raw_speech, raw_digits, speech_result
+        )
+
+        # Check for explicit transfer intent; confirm before proceeding
+        if _TRANSFER_RE.search(speech_result or ''):
+            # Ask for confirmation instead of transferring immediately
+            session['transfer_prev_step'] = current_step
+            session['step'] = 'confirm_transfer_request'
+            return _TRANSFER_PROMPT_XML
+
+        # If a transfer is pending, check if all required info is gathered; if so, transfer immediately
+        if session.get('transfer_pending'):
+            missing = _missing_fields_for_transfer(session)
+            if not missing:
+                return _TRANSFER_READY_XML
+
+        # Handle conversation flow
+        handler = _STEP_DISPATCH.get(current_step)
+        if handler:
+            return handler(Ctx(call_sid, session, response, session_store), speech_result)
+
+        logger.info(f"Call {call_sid} - No handler matched, returning empty response")
+        return str(response)
+
 @app.route('/voice/estimate', methods=['POST'])
+@twiml.xml_view
 def handle_estimate():
     """Provide estimate to customer"""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    session = call_sessions.get(call_sid, {})
+    call_sid = params.get('CallSid')
+    session = session_store.get(call_sid, {})
     
-    return provide_estimate(call_sid, session, response)
+    return est_handlers.provide_estimate(call_sid, session, response)
 
 @app.route('/voice/confirm_booking', methods=['POST'])
+@twiml.xml_view
 def handle_booking_confirmation():
     """Handle booking confirmation"""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    speech_result = request.values.get('SpeechResult', '').lower()
-    session = call_sessions.get(call_sid, {})
+    call_sid = params.get('CallSid')
+    speech_result = params.get('SpeechResult', '').lower()
+    session = session_store.get(call_sid, {})
     
-    return confirm_booking(call_sid, session, speech_result, response)
+    return est_handlers.confirm_booking(call_sid, session, speech_result, response)
 
 @app.route('/voice/confirm_callback', methods=['POST'])
+@twiml.xml_view
 def handle_callback_confirmation():
     """Handle callback request confirmation"""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    speech_result = request.values.get('SpeechResult', '').lower()
-    session = call_sessions.get(call_sid, {})
+    call_sid = params.get('CallSid')
+    speech_result = params.get('SpeechResult', '').lower()
+    session = session_store.get(call_sid, {})
     
-    return handle_callback_request(call_sid, session, speech_result, response)
+    return est_handlers.handle_callback_request(call_sid, session, speech_result, response)
 
 @app.route('/voice/check_time', methods=['GET', 'POST'])
+@twiml.xml_view
 def check_time():
     """Continue time check after initial keep-alive to prevent Twilio timeout"""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    logger.info(f"/voice/check_time invoked via {request.method} for CallSid={call_sid}")
+    call_sid = params.get('CallSid')
+    logger.info("/voice/check_time invoked via %s for CallSid=%s", request.method, call_sid)
     return conv_handlers.continue_time_check(call_sid, response)
 
 @app.route('/voice/check_availability', methods=['GET', 'POST'])
+@twiml.xml_view
 def check_availability():
     """Keep-alive hop before heavy availability check to avoid Twilio timeout."""
     response = VoiceResponse()
-    logger.info(f"/voice/check_availability invoked via {request.method}")
+    logger.info("/voice/check_availability invoked via %s", request.method)
     response.say("Thanks for holding. I'm still checking the nearest available crew time.", voice='Polly.Joanna')
     response.pause(length=1)
-    base_url = request.url_root.rstrip('/').replace('https://', 'http://')
-    response.redirect(f"{base_url}/voice/check_availability2", method='POST')
+    response.redirect(CHECK_AVAILABILITY2_URL or f"{_base_url()}/voice/check_availability2", method='POST')
     return str(response)
 
 @app.route('/voice/check_availability2', methods=['GET', 'POST'])
+@twiml.xml_view
 def check_availability2():
     """Stage 2 (finalize): complete availability check after keep-alive hop."""
+    params = _webhook_params()
     response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
-    logger.info(f"/voice/check_availability2 invoked via {request.method} for CallSid={call_sid}")
+    call_sid = params.get('CallSid')
+    logger.info("/voice/check_availability2 invoked via %s for CallSid=%s", request.method, call_sid)
     return conv_handlers.continue_availability_check(call_sid, response)
 
-def handle_greeting(call_sid, speech_result, response):
-    """Handle initial greeting and determine intent"""
-    session = call_sessions[call_sid]
-    
-    # Use AI to understand intent
+# Intent detection for the greeting runs while Twilio plays the acknowledgement.
+# Futures stay in this process; a redirect served by another worker recomputes
+# (the orphaned entry expires, since the redirect comes within seconds).
+_GREETING_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='greeting-intent')
+_greeting_futures = CallFutures(ttl=60)
+
+def _greeting_message(speech_result):
+    """Use AI to understand intent and pick the name prompt"""
     intent = ai_service.detect_intent(speech_result)
     
     if 'estimate' in intent or 'quote' in intent or 'price' in intent:
-        message = "Great! I can help with an estimate. Let's start with your full name."
+        return "Great! I can help with an estimate. Let's start with your full name."
     elif 'book' in intent or 'schedule' in intent or 'move' in intent:
-        message = "Perfect! I'll get you an estimate. What's your full name?"
+        return "Perfect! I'll get you an estimate. What's your full name?"
     else:
         # Use AI for unseen responses - but keep it short
         ai_response = ai_service.generate_response(speech_result, context="greeting")
-        message = ai_response + " What's your full name?"
+        return ai_response + " What's your full name?"
+
+def handle_greeting(ctx, speech_result):
+    """Acknowledge the greeting immediately; intent is resolved on the redirect hop"""
+    call_sid, session, response = ctx.call_sid, ctx.session, ctx.response
+    session['greeting_speech'] = speech_result
+    _greeting_futures.put(call_sid, _GREETING_EXECUTOR.submit(_greeting_message, speech_result))
     
-    session['step'] = 'collect_name'
+    response.say("One moment.", voice='Polly.Joanna')
+    response.redirect('/voice/greeting_intent', method='POST')
+    return str(response)
+
+@app.route('/voice/greeting_intent', methods=['GET', 'POST'])
+@twiml.xml_view
+def handle_greeting_intent():
+    """Stage 2 of the greeting: use the detected intent and ask for the name"""
+    params = _webhook_params()
+    response = VoiceResponse()
+    call_sid = params.get('CallSid')
+    session = session_store.get(call_sid, {})
+    speech_result = session.pop('greeting_speech', '')
     
-    gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
-    gather.say(message, voice='Polly.Joanna')
-    response.append(gather)
+    future = _greeting_futures.pop(call_sid)
+    try:
+        message = future.result(timeout=15) if future else _greeting_message(speech_result)
+    except Exception as e:
+        logger.error(f"Error resolving greeting intent: {e}")
+        message = "Great! I can help with an estimate. Let's start with your full name."
     
-    return str(response)
+    session['step'] = 'collect_name'
+    
+    return _gather_twiml(response, message, input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
 
-def handle_name(call_sid, speech_result, response):
+def handle_name(ctx, speech_result):
     """Collect and confirm name"""
-    session = call_sessions[call_sid]
+    session, response = ctx.session, ctx.response
     
     # Robust name extraction: AI + heuristic cleanup fallback
     raw = (speech_result or '').strip()
     name = ai_service.extract_name(raw) or ''
     if not name:
-        low = raw.lower()
-        # Remove common lead-in phrases
-        for tok in ["my name is", "this is", "i am", "i'm", "it's", "its", "name is"]:
-            low = low.replace(tok, ' ')
-        # Keep alphabetic and spaces, collapse whitespace
-        import re as _re
-        cleaned = _re.sub(r"[^a-zA-Z\s]", " ", low)
-        cleaned = _re.sub(r"\s+", " ", cleaned).strip()
+        # Remove common lead-in phrases, keep alphabetic words
+        cleaned = _NAME_KEEP_RE.sub(' ', _NAME_LEAD_IN_RE.sub(' ', raw.lower()))
         # Heuristic: up to two words, title-cased
-        parts = cleaned.split(" ")
-        parts = [p for p in parts if p]
+        parts = cleaned.split()
         if parts:
             name = " ".join(parts[:2]).title()
     
     if not name or len(name) < 2:
         session['step'] = 'collect_name'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Sorry, I didn't catch your name. Please say your first and last name.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "Sorry, I didn't catch your name. Please say your first and last name.", input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
 
     # Confirm the extracted name before proceeding
     session['data']['name_candidate'] = name
     session['step'] = 'confirm_name'
-    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say(f"I heard your name as {name}. Is that correct?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_twiml(response, f"I heard your name as {name}. Is that correct?", input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
 
-def handle_confirm_name(call_sid, speech_result, response):
+def handle_confirm_name(ctx, speech_result):
     """Confirm caller's name and proceed."""
-    session = call_sessions[call_sid]
+    call_sid, session, response = ctx.call_sid, ctx.session, ctx.response
     answer = validation_service.validate_yes_no(speech_result or '')
     if answer == 'yes':
         name = session['data'].pop('name_candidate', None) or session['data'].get('name')
         if not name:
             # Fallback: re-collect if lost
             session['step'] = 'collect_name'
-            gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-            gather.say("Please tell me your full name.", voice='Polly.Joanna')
-            response.append(gather)
-            return str(response)
+            return _gather_twiml(response, "Please tell me your full name.", input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
         session['data']['name'] = name
         session['step'] = 'confirm_calling_number'
 
@@ -504,31 +690,22 @@ def handle_confirm_name(call_sid, speech_result, response):
             + (f", {spoken_number}," if spoken_number else ",")
             + " for your estimate?"
         )
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto')
-        gather.say(confirm_msg, voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, confirm_msg, input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto')
     elif answer == 'no':
         session['data'].pop('name_candidate', None)
         session['step'] = 'collect_name'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("No problem. Please say your first and last name.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "No problem. Please say your first and last name.", input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
     else:
         session['step'] = 'confirm_name'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Is the name I heard correct?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "Is the name I heard correct?", input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
 
-def handle_phone(call_sid, speech_result, response):
+def handle_phone(ctx, speech_result):
     """Collect and confirm phone number"""
-    session = call_sessions[call_sid]
+    call_sid, session, response = ctx.call_sid, ctx.session, ctx.response
     
     # Check if this is a confirmation response (yes/no)
     if session.get('phone_needs_confirmation'):
-        if 'yes' in speech_result or 'correct' in speech_result or 'right' in speech_result or 'yeah' in speech_result or 'yep' in speech_result:
+        if validation_service.validate_yes_no(speech_result) == 'yes':
             # Phone confirmed, move to move type (skip email per request)
             session['step'] = 'collect_move_type'
             session['phone_needs_confirmation'] = False
@@ -536,46 +713,31 @@ def handle_phone(call_sid, speech_result, response):
             # Save session data in case of disconnect
             save_session_data(call_sid, session)
             
-            gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
-            gather.say("Great! What type of move? Local, long distance, junk removal, or in-home service?", voice='Polly.Joanna')
-            response.append(gather)
-            return str(response)
+            return _gather_twiml(response, "Great! What type of move? Local, long distance, junk removal, or in-home service?", input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
         else:
             # Phone not confirmed, ask again
             session['phone_needs_confirmation'] = False
             # Reset any previous buffer
             session['data'].pop('phone_digits_buffer', None)
-            gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14)
-            gather.say("Let's try again. Please say your phone number.", voice='Polly.Joanna')
-            response.append(gather)
-            return str(response)
+            return _gather_twiml(response, "Let's try again. Please say your phone number.", input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14, hints=DIGIT_HINTS)
     
-    # Extract digits and accumulate across utterances
+    # Extract digits and accumulate across utterances, keeping at most the
+    # last 14 (stays a str: sessions are JSON, which has no bytes type)
     buffer = session['data'].get('phone_digits_buffer', '')
     new_digits = validation_service.extract_digits(speech_result)
-    combined = (buffer + new_digits) if new_digits else buffer
+    combined = (buffer + new_digits)[-14:] if new_digits else buffer
 
     # If nothing detected yet, reprompt with guidance
     if not combined:
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14)
-        gather.say("I didn't catch that. Please say your phone number.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "I didn't catch that. Please say your phone number.", input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14, hints=DIGIT_HINTS)
 
     # Decide if we need more digits
     if len(combined) < 10:
         session['data']['phone_digits_buffer'] = combined
         # Acknowledge and ask for more - shorter message
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14)
-        gather.say(f"I have {len(combined)} digits. Please continue.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, f"I have {len(combined)} digits. Please continue.", input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14, hints=DIGIT_HINTS)
 
     # We have enough digits to attempt a number
-    # Limit to a reasonable max length
-    if len(combined) > 14:
-        combined = combined[-14:]
-
     phone_formatted = validation_service.format_phone(combined)
     session['data']['phone'] = phone_formatted
     session['data'].pop('phone_digits_buffer', None)
@@ -585,15 +747,12 @@ def handle_phone(call_sid, speech_result, response):
     save_session_data(call_sid, session)
     
     # Shorter confirmation - just read the formatted number
-    gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
-    gather.say(f"Got it. Your number is {phone_formatted}. Correct?", voice='Polly.Joanna')
-    response.append(gather)
     
-    return str(response)
+    return _gather_twiml(response, f"Got it. Your number is {phone_formatted}. Correct?", input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
 
-def handle_confirm_calling_number(call_sid, speech_result, response):
+def handle_confirm_calling_number(ctx, speech_result):
     """Ask to use the number the call is from; skip manual entry if confirmed"""
-    session = call_sessions[call_sid]
+    call_sid, session, response = ctx.call_sid, ctx.session, ctx.response
 
     # Prepare number variants
     calling_number = session.get('phone')
@@ -612,10 +771,7 @@ def handle_confirm_calling_number(call_sid, speech_result, response):
         # Save session data in case of disconnect
         save_session_data(call_sid, session)
 
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
-        gather.say("Great! What type of move? Local, long distance, junk removal, or in-home service?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "Great! What type of move? Local, long distance, junk removal, or in-home service?", input_types='speech dtmf', action='/voice/process', method='POST', timeout=4, speech_timeout='auto')
 
     if answer == 'no' or not formatted:
         # Ask the caller to provide their number
@@ -623,23 +779,18 @@ def handle_confirm_calling_number(call_sid, speech_result, response):
         # Reset any previous buffer
         session['data'].pop('phone_digits_buffer', None)
 
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14)
-        gather.say("No problem. Please say your phone number.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_twiml(response, "No problem. Please say your phone number.", input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=14, hints=DIGIT_HINTS)
 
     # Unclear response, re-prompt the same confirmation
-    gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto')
     if spoken:
-        gather.say(f"I didn't catch that. Would you like me to use the number you're calling from, {spoken}?", voice='Polly.Joanna')
+        message = f"I didn't catch that. Would you like me to use the number you're calling from, {spoken}?"
     else:
-        gather.say("I didn't catch that. Would you like me to use the number you're calling from?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+        message = "I didn't catch that. Would you like me to use the number you're calling from?"
+    return _gather_twiml(response, message, input_types='speech dtmf', action='/voice/process', method='POST', timeout=5, speech_timeout='auto')
 
-def handle_confirm_transfer_request(call_sid, speech_result, response):
+def handle_confirm_transfer_request(ctx, speech_result):
     """Confirm whether the caller really wants to transfer to a manager now."""
-    session = call_sessions.get(call_sid, {})
+    call_sid, session, response = ctx.call_sid, ctx.session, ctx.response
     answer = validation_service.validate_yes_no(speech_result or '')
 
     if answer == 'yes':
@@ -648,9 +799,7 @@ def handle_confirm_transfer_request(call_sid, speech_result, response):
         session['transfer_pending'] = True
         missing = _missing_fields_for_transfer(session)
         if not missing:
-            response.say("I'll transfer you to our manager right away. Please hold.", voice='Polly.Joanna')
-            response.dial('+18327999276')
-            return str(response)
+            return _TRANSFER_CONFIRMED_XML
         # Prompt for first missing field
         next_step = _step_for_field(missing[0])
         session['step'] = next_step
@@ -666,99 +815,77 @@ def handle_confirm_transfer_request(call_sid, speech_result, response):
         return _prompt_for_step(session['step'], response)
 
     # Unclear; ask again
-    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say("Sorry, would you like me to transfer you to our manager now?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
-
-# Import conversation handlers
-# Map additional handlers
-def handle_email(call_sid, speech_result, response):
-    return conv_handlers.handle_email(call_sid, speech_result, response)
-
-def handle_email_case(call_sid, speech_result, response):
-    return conv_handlers.handle_email_case(call_sid, speech_result, response)
-
-def handle_move_type(call_sid, speech_result, response):
-    return conv_handlers.handle_move_type(call_sid, speech_result, response)
-
-def handle_property_type(call_sid, speech_result, response):
-    return conv_handlers.handle_property_type(call_sid, speech_result, response)
-
-def handle_pickup_type(call_sid, speech_result, response):
-    return conv_handlers.handle_pickup_type(call_sid, speech_result, response)
-
-def handle_pickup_address(call_sid, speech_result, response):
-    return conv_handlers.handle_pickup_address(call_sid, speech_result, response)
-
-def handle_confirm_pickup_address(call_sid, speech_result, response):
-    return conv_handlers.handle_confirm_pickup_address(call_sid, speech_result, response)
-
-def handle_pickup_rooms(call_sid, speech_result, response):
-    return conv_handlers.handle_pickup_rooms(call_sid, speech_result, response)
-
-def handle_pickup_stairs(call_sid, speech_result, response):
-    return conv_handlers.handle_pickup_stairs(call_sid, speech_result, response)
-
-def handle_dropoff_type(call_sid, speech_result, response):
-    return conv_handlers.handle_dropoff_type(call_sid, speech_result, response)
-
-def handle_dropoff_address(call_sid, speech_result, response):
-    return conv_handlers.handle_dropoff_address(call_sid, speech_result, response)
-
-def handle_confirm_dropoff_address(call_sid, speech_result, response):
-    return conv_handlers.handle_confirm_dropoff_address(call_sid, speech_result, response)
-
-def handle_dropoff_rooms(call_sid, speech_result, response):
-    return conv_handlers.handle_dropoff_rooms(call_sid, speech_result, response)
-
-def handle_dropoff_stairs(call_sid, speech_result, response):
-    return conv_handlers.handle_dropoff_stairs(call_sid, speech_result, response)
-
-def handle_date(call_sid, speech_result, response):
-    return conv_handlers.handle_date(call_sid, speech_result, response)
-
-def handle_time(call_sid, speech_result, response):
-    return conv_handlers.handle_time(call_sid, speech_result, response)
-
-def handle_confirm_time(call_sid, speech_result, response):
-    return conv_handlers.handle_confirm_time(call_sid, speech_result, response)
-
-def handle_packing(call_sid, speech_result, response):
-    return conv_handlers.handle_packing(call_sid, speech_result, response)
-
-def handle_special_items(call_sid, speech_result, response):
-    return conv_handlers.handle_special_items(call_sid, speech_result, response)
-
-def handle_special_instructions(call_sid, speech_result, response):
-    return conv_handlers.handle_special_instructions(call_sid, speech_result, response)
-
-def handle_ask_process_explanation(call_sid, speech_result, response):
-    return conv_handlers.handle_ask_process_explanation(call_sid, speech_result, response)
-
-def handle_process_explanation(call_sid, speech_result, response):
-    return conv_handlers.handle_process_explanation(call_sid, speech_result, response)
-
-# Import estimate handlers
-def provide_estimate(call_sid, session, response):
-    return est_handlers.provide_estimate(call_sid, session, response)
-
-def confirm_booking(call_sid, session, speech_result, response):
-    return est_handlers.confirm_booking(call_sid, session, speech_result, response)
-
-def handle_alternative_selection(call_sid, session, speech_result, response):
-    return est_handlers.handle_alternative_selection(call_sid, session, speech_result, response)
-
-def handle_callback_request(call_sid, session, speech_result, response):
-    return est_handlers.handle_callback_request(call_sid, session, speech_result, response)
+    return _TRANSFER_ASK_AGAIN_XML
+
+def _with_session(handler):
+    """Adapt a (call_sid, session, speech_result, response) handler to the step signature"""
+    def _call(ctx, speech_result):
+        return handler(ctx.call_sid, ctx.session, speech_result, ctx.response)
+    return _call
+
+def _with_call_sid(handler):
+    """Adapt a (call_sid, speech_result, response) handler to the step signature"""
+    def _call(ctx, speech_result):
+        return handler(ctx.call_sid, speech_result, ctx.response)
+    return _call
+
+def _handle_time_logged(ctx, speech_result):
+    twiml_response = conv_handlers.handle_time(ctx.call_sid, speech_result, ctx.response)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Call %s - TwiML response from handle_time (length: %d): %s", ctx.call_sid, len(twiml_response), twiml_response[:500])
+    return twiml_response
+
+# Step -> handler(ctx, speech_result), looked up once per turn in process_speech
+_STEP_DISPATCH = {
+    'greeting': handle_greeting,
+    'collect_name': handle_name,
+    'confirm_name': handle_confirm_name,
+    'collect_phone': handle_phone,
+    'confirm_calling_number': handle_confirm_calling_number,
+    'confirm_transfer_request': handle_confirm_transfer_request,
+    'collect_email': _with_call_sid(conv_handlers.handle_email),
+    'collect_email_case': _with_call_sid(conv_handlers.handle_email_case),
+    'collect_move_type': _with_call_sid(conv_handlers.handle_move_type),
+    'collect_property_type': _with_call_sid(conv_handlers.handle_property_type),
+    'collect_pickup_type': _with_call_sid(conv_handlers.handle_pickup_type),
+    'collect_pickup_address': _with_call_sid(conv_handlers.handle_pickup_address),
+    'confirm_pickup_address': _with_call_sid(conv_handlers.handle_confirm_pickup_address),
+    'collect_pickup_rooms': _with_call_sid(conv_handlers.handle_pickup_rooms),
+    'confirm_pickup_rooms': _with_call_sid(conv_handlers.handle_confirm_pickup_rooms),
+    'collect_pickup_stairs': _with_call_sid(conv_handlers.handle_pickup_stairs),
+    'collect_dropoff_type': _with_call_sid(conv_handlers.handle_dropoff_type),
+    'collect_dropoff_address': _with_call_sid(conv_handlers.handle_dropoff_address),
+    'confirm_dropoff_address': _with_call_sid(conv_handlers.handle_confirm_dropoff_address),
+    'collect_dropoff_rooms': _with_call_sid(conv_handlers.handle_dropoff_rooms),
+    'confirm_dropoff_rooms': _with_call_sid(conv_handlers.handle_confirm_dropoff_rooms),
+    'collect_dropoff_stairs': _with_call_sid(conv_handlers.handle_dropoff_stairs),
+    'collect_date': _with_call_sid(conv_handlers.handle_date),
+    'collect_time': _handle_time_logged,
+    'confirm_time': _with_call_sid(conv_handlers.handle_confirm_time),
+    'collect_packing': _with_call_sid(conv_handlers.handle_packing),
+    'collect_special_items': _with_call_sid(conv_handlers.handle_special_items),
+    'collect_special_instructions': _with_call_sid(conv_handlers.handle_special_instructions),
+    'ask_process_explanation': _with_call_sid(conv_handlers.handle_ask_process_explanation),
+    'explain_process': _with_call_sid(conv_handlers.handle_process_explanation),
+    'provide_estimate': lambda ctx, speech_result: est_handlers.provide_estimate(ctx.call_sid, ctx.session, ctx.response),
+    'confirm_booking': _with_session(est_handlers.confirm_booking),
+    'handle_alternative_selection': _with_session(est_handlers.handle_alternative_selection),
+    'handle_discount_offer': _with_session(est_handlers.handle_discount_offer),
+    'handle_inhouse_estimate': _with_session(est_handlers.handle_inhouse_estimate),
+    'collect_final_pickup_address': _with_session(est_handlers.handle_final_pickup_address),
+    'confirm_final_pickup_address': _with_session(est_handlers.handle_confirm_final_pickup_address),
+    'collect_final_dropoff_address': _with_session(est_handlers.handle_final_dropoff_address),
+    'confirm_final_dropoff_address': _with_session(est_handlers.handle_confirm_final_dropoff_address),
+    'confirm_sms_received': _with_session(est_handlers.handle_confirm_sms_received),
+    'confirm_phone_for_sms': _with_session(est_handlers.handle_confirm_phone_for_sms),
+    'collect_phone_for_sms': _with_session(est_handlers.handle_collect_phone_for_sms),
+}
 
 @app.route('/voice/transfer', methods=['POST'])
+@twiml.xml_view
 def transfer_call():
     """Transfer call to manager"""
-    response = VoiceResponse()
-    response.say("Transferring you now. Please hold.", voice='Polly.Joanna')
-    response.dial('+18327999276')
-    return str(response)
+    return _TRANSFER_XML
 @app.route('/outbound/lead', methods=['POST'])
 def handle_outbound_lead():
     """Handle outbound calls to leads from website forms"""
@@ -767,136 +894,197 @@ def handle_outbound_lead():
     name = data.get('name', 'there')
     email = data.get('email')
     
-    # Auto-detect the base URL from the request
-    # Use HTTP for ngrok free tier (HTTPS has issues)
-    base_url = request.url_root.rstrip('/').replace('https://', 'http://')
+    # PUBLIC_BASE_URL, or auto-detected from the request
+    base_url = _base_url()
     
     logger.info(f"Using base URL: {base_url}")
     
+    # Create the outbound call off the request path; the outcome is logged
+    _NOTIFY_EXECUTOR.submit(
+        _create_outbound_call,
+        phone,
+        url=f"{base_url}/voice/outbound",
+        status_callback=f"{base_url}/voice/status"
+    )
+    return jsonify({'status': 'queued'}), 202
+
+def _create_outbound_call(phone, url, status_callback):
+    """Place an outbound lead call (runs on the notify executor)"""
     try:
-        # Create outbound call
         call = twilio_client.calls.create(
             to=phone,
-            from_=os.getenv('TWILIO_PHONE_NUMBER'),
-            url=f"{base_url}/voice/outbound",
-            status_callback=f"{base_url}/voice/status",
-            record=os.getenv('ENABLE_CALL_RECORDING', 'True') == 'True',
+            from_=Config.TWILIO_PHONE_NUMBER,
+            url=url,
+            status_callback=status_callback,
+            record=Config.ENABLE_CALL_RECORDING,
             machine_detection='DetectMessageEnd'
         )
-        
         logger.info(f"Outbound call initiated to {phone}: {call.sid}")
-        return jsonify({'call_sid': call.sid, 'status': 'initiated'})
-        
     except Exception as e:
         logger.error(f"Error creating outbound call: {e}")
-        return jsonify({'error': str(e)}), 500
+
+def _render_outbound_xml():
+    response = VoiceResponse()
+    # Simple greeting for outbound calls
+    response.say(
+        "Hello, this is USF Moving Company calling about your moving inquiry. "
+        "If you'd like to talk to our manager, press zero at any time. "
+        "I can provide you with an estimate today. What is your full name?",
+        voice='Polly.Joanna'
+    )
+    # Wait for response
+    gather = _make_gather(
+        input_types='speech dtmf',
+        action='/voice/process',
+        method='POST',
+        timeout=6,
+        speech_timeout='auto',
+        finish_on_key='0'
+    )
+    response.append(gather)
+    return twiml.static_xml(response)
+
+def _render_outbound_error_xml():
+    response = VoiceResponse()
+    response.say(
+        "Sorry, there was an error. Please call us at 2 8 1, 7 4 3, 4 5 0 3.",
+        voice='Polly.Joanna'
+    )
+    return twiml.static_xml(response)
+
+# Outbound call script; identical for every lead, so rendered once
+_OUTBOUND_XML = _render_outbound_xml()
+_OUTBOUND_ERROR_XML = _render_outbound_error_xml()
+
 @app.route('/voice/outbound', methods=['GET', 'POST'])
+@twiml.xml_view
 def handle_outbound_call():
     """Handle outbound call script"""
-    response = VoiceResponse()
-    call_sid = request.values.get('CallSid')
+    params = _webhook_params()
+    call_sid = params.get('CallSid')
     
     try:
-        # Simple greeting for outbound calls
-        response.say(
-            "Hello, this is USF Moving Company calling about your moving inquiry. "
-            "If you'd like to talk to our manager, press zero at any time. "
-            "I can provide you with an estimate today. What is your full name?",
-            voice='Polly.Joanna'
-        )
-        
         # Initialize session
-        from_number = request.values.get('To')  # The number we're calling
+        from_number = params.get('To')  # The number we're calling
         
-        call_sessions[call_sid] = {
+        session_store.set(call_sid, {
             'phone': from_number,
             'step': 'collect_name',
             'data': {},
             'customer': None
-        }
+        })
         
-        # Wait for response
-        gather = _make_gather(
-            input_types='speech dtmf',
-            action='/voice/process',
-            method='POST',
-            timeout=6,
-            speech_timeout='auto',
-            finish_on_key='0'
-        )
-        response.append(gather)
-        
-        return str(response)
+        return _OUTBOUND_XML
         
     except Exception as e:
         logger.error(f"Error in outbound call: {e}")
-        response.say(
-            "Sorry, there was an error. Please call us at 2 8 1, 7 4 3, 4 5 0 3.",
-            voice='Polly.Joanna'
-        )
-        return str(response)
+        return _OUTBOUND_ERROR_XML
 @app.route('/voice/status', methods=['GET', 'POST'])
 def handle_call_status():
     """Handle call status callbacks"""
-    call_sid = request.values.get('CallSid')
-    call_status = request.values.get('CallStatus')
+    params = _webhook_params()
+    call_sid = params.get('CallSid')
+    call_status = params.get('CallStatus')
     
-    logger.info(f"Call {call_sid} status: {call_status}")
+    logger.info("Call %s status: %s", call_sid, call_status)
+    _greeting_futures.pop(call_sid)
+    conv_handlers.discard_pending(call_sid)
     
-    # Save session data before call ends
-    if call_status in ['completed', 'failed', 'busy', 'no-answer'] and call_sid in call_sessions:
+    if call_status in ['completed', 'failed', 'busy', 'no-answer']:
+        session = None
         try:
-            session = call_sessions[call_sid]
-            save_session_data(call_sid, session)
-            
-            # Send follow-up if call disconnected with partial data
-            data = session.get('data', {})
-            if call_status == 'completed' and 'name' in data and 'email' not in data:
-                # Call completed but didn't get all info - send follow-up
-                try:
-                    phone = data.get('phone', session.get('phone'))
-                    if phone:
-                        follow_up_msg = f"Hi {data['name']}, this is USF Moving. We got disconnected. Please reply with your email or call us back at (281) 743-4503 for your moving estimate."
-                        sms_service.send_sms(phone, follow_up_msg)
-                        logger.info(f"Sent follow-up SMS to {phone}")
-                except Exception as e:
-                    logger.error(f"Error sending follow-up: {e}", exc_info=True)
+            # Save session data before call ends
+            session = session_store.get(call_sid)
+            if session is not None:
+                save_session_data(call_sid, session)
+                # The call is over and its data was snapshotted; drop the session
+                session_store.delete(call_sid)
         except Exception as e:
             logger.error(f"Error handling call status for {call_sid}: {e}", exc_info=True)
+        
+        # Follow-up SMS and call logging happen after Twilio has its 200
+        _NOTIFY_EXECUTOR.submit(_finish_call, call_sid, call_status, session)
+    
+    return '', 200
+
+_SMS_FOLLOW_UP_TMPL = (
+    "Hi {name}, this is USF Moving. We got disconnected. "
+    "Please reply with your email or call us back at (281) 743-4503 for your moving estimate."
+).format_map
+
+def _finish_call(call_sid, call_status, session):
+    """Send the disconnect follow-up and log the call (runs on the notify executor)"""
+    if session is not None:
+        # Send follow-up if call disconnected with partial data
+        data = session.get('data', {})
+        if call_status == 'completed' and 'name' in data and 'email' not in data:
+            # Call completed but didn't get all info - send follow-up
+            try:
+                phone = data.get('phone', session.get('phone'))
+                if phone:
+                    follow_up_msg = _SMS_FOLLOW_UP_TMPL({'name': data['name']})
+                    sms_service.send_sms(phone, follow_up_msg)
+                    logger.info(f"Sent follow-up SMS to {phone}")
+            except Exception as e:
+                logger.error(f"Error sending follow-up: {e}", exc_info=True)
     
     # Log call in database
     try:
-        if call_status in ['completed', 'failed', 'busy', 'no-answer']:
-            booking_service.log_call(call_sid, call_status)
+        booking_service.log_call(call_sid, call_status)
     except Exception as e:
         logger.error(f"Error logging call: {e}", exc_info=True)
-    
-    return '', 200
+
+# "From: <pickup>" / "To: <dropoff>" lines in an inbound SMS
+_SMS_ADDRESS_RE = re.compile(r'^[ \t]*(from|to)[ \t]*:(.*)$', re.IGNORECASE | re.MULTILINE)
+
+# SMS bodies, built once; filled with format_map at send time
+_SMS_UPDATED_TMPL = (
+    "Thanks! We've updated your booking.\n"
+    "Booking ID: {booking_id}\n"
+    "Pickup: {pickup}\nDrop-off: {dropoff}\n"
+    "Date/Time: {date} {time}"
+).format_map
+_SMS_MANAGER_TMPL = (
+    "USF Moving - Final Booking Info\n"
+    "Booking ID: {booking_id}\n"
+    "Name: {name}\n"
+    "Phone: {phone}\n"
+    "Date: {date}  Time: {time}\n"
+    "Pickup: {pickup}\n"
+    "Drop-off: {dropoff}\n"
+    "Estimate: ${estimate}  Crew: {move_type}"
+).format_map
+_SMS_FORMAT_HELP = (
+    "Thanks for texting USF Moving! Please reply with your addresses in this format:\n"
+    "From: <pickup address>\nTo: <drop-off address>"
+)
 
 @app.route('/sms/incoming', methods=['POST'])
 def handle_incoming_sms():
-    """Handle incoming SMS messages"""
-    from_number = request.values.get('From')
-    message_body = request.values.get('Body')
-    
+    """Handle incoming SMS messages (the sheet update and replies run in the background)"""
+    params = _webhook_params()
+    _NOTIFY_EXECUTOR.submit(_process_incoming_sms, params.get('From'), params.get('Body'))
+    return '', 200
+
+def _process_incoming_sms(from_number, message_body):
+    """Parse an inbound SMS, update the booking and reply (runs on the notify executor)"""
+    try:
+        _handle_sms_body(from_number, message_body)
+    except Exception as e:
+        logger.error(f"Error handling incoming SMS from {from_number}: {e}", exc_info=True)
+
+def _handle_sms_body(from_number, message_body):
+    """Address-update flow for one inbound SMS"""
     # Log SMS
     booking_service.log_sms(from_number, message_body, 'inbound')
 
     # Try to parse addresses of the form:
     # From: <pickup>
     # To: <dropoff>
-    pickup_text = None
-    dropoff_text = None
-    try:
-        lines = (message_body or '').splitlines()
-        for line in lines:
-            low = line.lower().strip()
-            if low.startswith('from:'):
-                pickup_text = line.split(':', 1)[1].strip()
-            elif low.startswith('to:'):
-                dropoff_text = line.split(':', 1)[1].strip()
-    except Exception:
-        pass
+    # (last occurrence of each label wins)
+    matches = {m.group(1).lower(): m.group(2).strip() for m in _SMS_ADDRESS_RE.finditer(message_body or '')}
+    pickup_text = matches.get('from')
+    dropoff_text = matches.get('to')
 
     # If we got both addresses, update the latest booking for this phone and notify parties
     if pickup_text and dropoff_text:
@@ -906,38 +1094,29 @@ def handle_incoming_sms():
             booking_id = updated.get('Booking ID') or updated.get('BookingId') or ''
             date_str = updated.get('Move Date', '')
             time_str = updated.get('Move Time', '')
-            confirm_msg = (
-                f"Thanks! We've updated your booking.\n"
-                f"Booking ID: {booking_id}\n"
-                f"Pickup: {pickup_text}\nDrop-off: {dropoff_text}\n"
-                f"Date/Time: {date_str} {time_str}"
-            )
-            sms_service.send_sms(from_number, confirm_msg)
+            fields = {
+                'booking_id': booking_id,
+                'name': updated.get('Customer Name', ''),
+                'phone': updated.get('Phone', ''),
+                'date': date_str,
+                'time': time_str,
+                'pickup': pickup_text,
+                'dropoff': dropoff_text,
+                'estimate': updated.get('Total Estimate', ''),
+                'move_type': updated.get('Move Type', '')
+            }
+            sms_service.send_sms(from_number, _SMS_UPDATED_TMPL(fields))
 
             # Notify manager with final info
-            manager_msg = (
-                "USF Moving - Final Booking Info\n"
-                f"Booking ID: {booking_id}\n"
-                f"Name: {updated.get('Customer Name','')}\n"
-                f"Phone: {updated.get('Phone','')}\n"
-                f"Date: {date_str}  Time: {time_str}\n"
-                f"Pickup: {pickup_text}\n"
-                f"Drop-off: {dropoff_text}\n"
-                f"Estimate: ${updated.get('Total Estimate','')}  Crew: {updated.get('Move Type','')}"
-            )
+            manager_msg = _SMS_MANAGER_TMPL(fields)
             try:
-                sms_service.send_sms('+18327999276', manager_msg)
+                sms_service.send_sms(Config.MANAGER_PHONE, manager_msg)
             except Exception:
                 pass
-            return '', 200
+            return
 
     # Fallback auto-reply if not parsed
-    response_message = (
-        "Thanks for texting USF Moving! Please reply with your addresses in this format:\n"
-        "From: <pickup address>\nTo: <drop-off address>"
-    )
-    sms_service.send_sms(from_number, response_message)
-    return '', 200
+    sms_service.send_sms(from_number, _SMS_FORMAT_HELP)
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -947,4 +1126,5 @@ def health_check():
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'False') == 'True'
+    warm_up_clients()
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -21,6 +21,7 @@ class Config:
     COMPANY_PHONE = os.getenv('COMPANY_PHONE', '(281) 743-4503')
     OFFICE_ADDRESS = os.getenv('OFFICE_ADDRESS', '2800 Rolido Dr Apt 238, Houston, TX 77063')
     WEBSITE = os.getenv('WEBSITE', 'https://www.usfhoustonmoving.com/')
+    MANAGER_PHONE = os.getenv('MANAGER_PHONE', '+18327999276')
     
     # Twilio Configuration
     TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
@@ -52,6 +53,7 @@ class Config:
     ENABLE_SMS_NOTIFICATIONS = os.getenv('ENABLE_SMS_NOTIFICATIONS', 'True') == 'True'
     ENABLE_EMAIL_NOTIFICATIONS = os.getenv('ENABLE_EMAIL_NOTIFICATIONS', 'True') == 'True'
     ENABLE_BACKLINK_AUTOMATION = os.getenv('ENABLE_BACKLINK_AUTOMATION', 'False') == 'True'
+    VALIDATE_TWILIO_SIGNATURE = os.getenv('VALIDATE_TWILIO_SIGNATURE', 'False') == 'True'
     
     # Voice Settings
     VOICE_GENDER = os.getenv('VOICE_GENDER', 'female')
@@ -64,9 +66,14 @@ class Config:
     # Application Configuration
     BASE_URL = os.getenv('BASE_URL', 'http://localhost:5000')
     
-    @staticmethod
-    def validate_config():
+    # Set once validate_config() has passed; the env doesn't change after boot
+    _validated = False
+
+    @classmethod
+    def validate_config(cls):
         """Validate that all required configuration is present"""
+        if cls._validated:
+            return True
         required_vars = [
             'TWILIO_ACCOUNT_SID',
             'TWILIO_AUTH_TOKEN',
@@ -84,6 +91,7 @@ class Config:
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
         
+        cls._validated = True
         return True
 
 
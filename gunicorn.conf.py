@@ -0,0 +1,21 @@
+# Gunicorn settings shared by Procfile, render.yaml and the Dockerfile
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Threaded workers: a webhook blocked on Sheets/Maps/OpenAI I/O releases the
+# GIL, so one worker keeps answering other calls instead of queueing them.
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+
+# More than one worker needs REDIS_URL so every worker sees the same call sessions
+workers = int(os.getenv('WEB_CONCURRENCY', 4 if os.getenv('REDIS_URL') else 1))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+keepalive = 5
+
+
+def post_worker_init(worker):
+    # Warm OpenAI/Twilio connections in each worker (not in the preloading master)
+    from app import warm_up_clients
+    warm_up_clients()
@@ -0,0 +1,17 @@
+# Per-turn state handed to the /voice/process step handlers
+from dataclasses import dataclass
+from twilio.twiml.voice_response import VoiceResponse
+from services.session_store import SessionStore
+
+
+@dataclass(slots=True)
+class Ctx:
+    """One caller turn: the call, its loaded session and the TwiML being built"""
+    call_sid: str
+    session: dict
+    response: VoiceResponse
+    store: SessionStore
+
+    def flush(self):
+        """Persist the session now instead of at the end of the turn"""
+        self.store.set(self.call_sid, self.session)
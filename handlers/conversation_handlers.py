@@ -1,5 +1,7 @@
-from twilio.twiml.voice_response import VoiceResponse, Gather
+from twilio.twiml.voice_response import VoiceResponse, Gather, Say, Redirect
+import functools
 import os
+import re
 
 # Import services at the top
 from services.validation_service import ValidationService
@@ -7,24 +9,109 @@ from services.distance_service import DistanceService
 from services.ai_service import AIService
 from services.calendar_service import CalendarService
 from utils.logger import logger
+from utils import twiml
+from utils.call_futures import CallFutures
 from flask import request
-from threading import Thread
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from services.booking_service import BookingService
+from services.session_store import SessionStore
 
 # Initialize services
 validation_service = ValidationService()
 distance_service = DistanceService()
 ai_service = AIService()
 calendar_service = CalendarService()
+session_store = SessionStore()
+booking_service = BookingService()
+
+# Bookings warm-ups and route lookups run here; worker threads start on first submit (after fork)
+_WARM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bookings-warm')
+
+# Route lookups started at the drop-off ZIP confirmation, collected in handle_time.
+# Futures stay in this process; a turn served by another worker falls back to
+# the check_time redirect (and provide_estimate computes distances itself), and
+# the orphaned entry expires.
+PENDING_LOOKUP_TTL = int(os.getenv('PENDING_LOOKUP_TTL_SECONDS', 900))
+_route_futures = CallFutures(ttl=PENDING_LOOKUP_TTL)
+ROUTE_WAIT_SECONDS = float(os.getenv('ROUTE_WAIT_SECONDS', 5))
+
+def _collect_route(call_sid, session, wait=True):
+    """Copy a background route lookup into the session (wait=False: only if it has finished)"""
+    future = _route_futures.get(call_sid)
+    if future is None or not (wait or future.done()):
+        return
+    _route_futures.pop(call_sid)
+    try:
+        dist_info = future.result(timeout=ROUTE_WAIT_SECONDS)
+    except Exception as e:
+        logger.warning(f"Call {call_sid} - Route lookup not available: {e}")
+        return
+    if dist_info.get('success'):
+        # Save both roundtrip and point-to-point for pricing clarity
+        data = session['data']
+        data['total_distance_roundtrip'] = dist_info.get('total_distance', 0)
+        data['p2p_distance'] = dist_info.get('p2p_distance', 0)
+        data['p2d_duration_minutes'] = dist_info.get('p2d_duration_minutes', 0)
+    else:
+        logger.warning(f"Call {call_sid} - Distance calc failed at confirm_dropoff: {dist_info.get('error')}")
+
+# Weekly booking counts for pricing, started when the process-explanation question is
+# asked (either answer leads to the estimate), collected by provide_estimate.
+_weekly_futures = CallFutures(ttl=PENDING_LOOKUP_TTL)
+
+@functools.lru_cache(maxsize=512)
+def move_week_start(move_date):
+    """Monday of the week of an ISO move date (memoized per date string)"""
+    day = datetime.fromisoformat(move_date)
+    return day - timedelta(days=day.weekday())
+
+def prefetch_weekly_bookings(call_sid, move_date):
+    """Start counting the move week's bookings in the background (once per call and week)"""
+    try:
+        week_start = move_week_start(move_date)
+    except (TypeError, ValueError):
+        return
+    entry = _weekly_futures.get(call_sid)
+    if entry is not None and entry[0] == week_start:
+        return
+    _weekly_futures.put(call_sid, (week_start, _WARM_POOL.submit(booking_service.count_weekly_bookings, week_start)))
+
+def take_weekly_bookings(call_sid, week_start):
+    """Result of a prefetched weekly count for this week, else None"""
+    entry = _weekly_futures.pop(call_sid)
+    if entry is None or entry[0] != week_start:
+        return None
+    try:
+        return entry[1].result(timeout=ROUTE_WAIT_SECONDS)
+    except Exception as e:
+        logger.warning(f"Call {call_sid} - Weekly bookings prefetch not available: {e}")
+        return None
+
+def discard_pending(call_sid):
+    """Forget a call's pending background lookups (call ended)"""
+    _route_futures.pop(call_sid)
+    _weekly_futures.pop(call_sid)
 
 # Feature flag: control verbosity of ZIP guidance example
 ZIP_GUIDANCE_VERBOSE = os.getenv('ZIP_GUIDANCE_VERBOSE', 'true').lower() == 'true'
 
-def _zip_hint():
-    if ZIP_GUIDANCE_VERBOSE:
-        return " Please say five digits like seven-seven-zero-six-three. If zero is part of your ZIP, please say 'zero' instead of pressing 0."
-    return ""
+ZIP_HINT = (
+    " Please say five digits like seven-seven-zero-six-three. If zero is part of your ZIP, please say 'zero' instead of pressing 0."
+    if ZIP_GUIDANCE_VERBOSE else ""
+)
+
+def _zip_progress_prompts(label):
+    """Partial-ZIP prompts ("I have N digits..."), indexed by digits heard so far (0-4)"""
+    return [
+        f"I have {have} digit{'s' if have != 1 else ''}. Please continue with your {label} ZIP code." + ZIP_HINT
+        for have in range(5)
+    ]
+
+_PICKUP_ZIP_PROGRESS = _zip_progress_prompts('pickup')
+_DROPOFF_ZIP_PROGRESS = _zip_progress_prompts('drop-off')
+_PICKUP_ZIP_RETRY = "Let's try again. What's the pickup ZIP code?" + ZIP_HINT
+_DROPOFF_ZIP_RETRY = "Let's try again. What's the drop-off ZIP code?" + ZIP_HINT
 
 # Twilio Speech Recognition tuning (env-configurable)
 SPEECH_LANGUAGE = os.getenv('TWILIO_SPEECH_LANGUAGE', 'en-US')
@@ -35,44 +122,123 @@ DEFAULT_HINTS = os.getenv(
     'local,long distance,junk removal,in-home service,house,apartment,office,warehouse,yes,no,'
     'morning,afternoon,evening,flexible,one,two,three,four,five,six,seven,eight,nine,zero,oh,o,zip,zip code,from,to'
 )
+# Narrower hints for ZIP entry: fewer alternatives for the recognizer
+DIGIT_HINTS = os.getenv(
+    'TWILIO_DIGIT_HINTS',
+    'zero,oh,one,two,three,four,five,six,seven,eight,nine,plus,zip,zip code'
+)
 
-# Global call sessions dictionary (will be imported from app.py)
-# This is just a placeholder - app.py will manage the actual sessions
-call_sessions = {}
+# Absolute redirect targets: PUBLIC_BASE_URL when set, resolved once; else from each request
+PUBLIC_BASE_URL = os.getenv('PUBLIC_BASE_URL', '').rstrip('/')
+CHECK_TIME_URL = f"{PUBLIC_BASE_URL}/voice/check_time" if PUBLIC_BASE_URL else None
+CHECK_AVAILABILITY_URL = f"{PUBLIC_BASE_URL}/voice/check_availability" if PUBLIC_BASE_URL else None
+
+# Keep-alive phrases on the availability wait path. Set *_AUDIO_URL to a hosted MP3 of the
+# same phrase to <Play> it instead of synthesizing the <Say> on every call.
+_HOLD_URL = os.getenv('HOLD_AUDIO_URL') or None
+_CHECKING_URL = os.getenv('CHECKING_AUDIO_URL') or None
+_PATIENCE_URL = os.getenv('PATIENCE_AUDIO_URL') or None
+_CONTINUE_URL = os.getenv('CONTINUE_AUDIO_URL') or None
+
+def _keep_alive(response, url, text):
+    """Play the cached recording of a fixed phrase when configured, else say it"""
+    if url:
+        response.play(url)
+    else:
+        response.say(text, voice='Polly.Joanna')
+
+def _base_url():
+    """Base URL for Twilio callbacks (PUBLIC_BASE_URL, else the request's root)"""
+    if PUBLIC_BASE_URL:
+        return PUBLIC_BASE_URL
+    # Use HTTP for ngrok free tier (HTTPS has issues)
+    return request.url_root.rstrip('/').replace('https://', 'http://')
+
+# Attributes shared by every Gather in this module (ASR tuning, speech + keypad input)
+_GATHER_KWARGS = dict(
+    input='speech dtmf',
+    method='POST',
+    speech_timeout='auto',
+    language=SPEECH_LANGUAGE,
+    enhanced=SPEECH_ENHANCED,
+    speech_model=SPEECH_MODEL,
+    finishOnKey='0',
+)
 
-def set_call_sessions(sessions):
-    """Set the call sessions dictionary from app.py"""
-    global call_sessions
-    call_sessions = sessions
+# Rendered gather_speech TwiML per (action, hints): (Gather head, Gather close + fallback tail)
+_GATHER_SPEECH_XML = {}
+
+def _gather_speech_template(action, hints):
+    template = _GATHER_SPEECH_XML.get((action, hints))
+    if template is None:
+        gather = Gather(**_GATHER_KWARGS, action=action, timeout=4, hints=hints, actionOnEmptyResult=True)
+        # Gentle fallback if the caller doesn't respond, then retry the same action
+        tail = (
+            Say("I didn't catch that. Let's try once more.", voice='Polly.Joanna').to_xml(xml_declaration=False)
+            + Redirect(action, method='POST').to_xml(xml_declaration=False)
+        )
+        head, gather_tail = twiml.gather_template(gather)
+        template = _GATHER_SPEECH_XML[(action, hints)] = (head, gather_tail + tail)
+    return template
 
-def gather_speech(response, message, action='/voice/process'):
+def gather_speech(response, message, action='/voice/process', hints=DEFAULT_HINTS):
     """Helper to create Gather with speech and DTMF input"""
-    gather = Gather(
-        input='speech dtmf',
-        action=action,
-        method='POST',
-        timeout=4,
-        speech_timeout='auto',
-        language=SPEECH_LANGUAGE,
-        enhanced=SPEECH_ENHANCED,
-        speech_model=SPEECH_MODEL,
-        hints=DEFAULT_HINTS,
-        actionOnEmptyResult=True,
-        finishOnKey='0'
-    )
-    gather.say(message, voice='Polly.Joanna')
-    response.append(gather)
-    
-    # Add gentle fallback if user doesn't respond, then retry the same action
-    response.say("I didn't catch that. Let's try once more.", voice='Polly.Joanna')
-    # Redirect back to the same action to re-prompt instead of auto-transferring
-    response.redirect(action, method='POST')
-    
-    return str(response)
+    return twiml.append_xml(response, twiml.fill_gather(_gather_speech_template(action, hints), message))
+
+# ZIP entry Gathers, rendered once: collecting digits, then confirming the ZIP
+_ZIP_DIGITS_GATHER = twiml.gather_template(Gather(
+    **_GATHER_KWARGS, action='/voice/process', timeout=6, num_digits=5, actionOnEmptyResult=True, hints=DIGIT_HINTS
+))
+_ZIP_CONFIRM_GATHER = twiml.gather_template(Gather(
+    **_GATHER_KWARGS, action='/voice/process', timeout=6, hints=DEFAULT_HINTS
+))
+
+def _keyword_matcher(classes, whole_words=False):
+    """Compile ordered (label, keywords) classes into one regex.
+
+    The returned function scans each text once and gives the label of the
+    earliest class with any keyword present, like an if/elif chain of `in` tests.
+    With whole_words, a keyword must be a whole word (plural "s" allowed),
+    so "homeowner" is not "home".
+    """
+    group = r"(\b(?:{})s?\b)" if whole_words else "({})"
+    pattern = re.compile('|'.join(
+        group.format('|'.join(map(re.escape, keywords))) for _, keywords in classes
+    ))
+    labels = [label for label, _ in classes]
+
+    def match(*texts):
+        best = None
+        for text in texts:
+            for m in pattern.finditer(text):
+                i = m.lastindex - 1
+                if best is None or i < best:
+                    best = i
+        return None if best is None else labels[best]
+    return match
+
+_match_move_type = _keyword_matcher([
+    ('Long Distance', ['long distance']),
+    ('Junk Removal', ['junk']),
+    ('In-Home Service', ['in-home', 'in home']),
+    ('Local', ['local']),
+])
+_match_property_type = _keyword_matcher([
+    ('residential', ['residential', 'residence', 'resident', 'home']),
+    ('commercial', ['commercial', 'business', 'office', 'warehouse']),
+], whole_words=True)
+_match_residential_location = _keyword_matcher([
+    ('house', ['house', 'home', 'townhouse', 'townhome']),
+    ('apartment', ['apartment', 'apt', 'condo', 'condominium']),
+], whole_words=True)
+_match_commercial_location = _keyword_matcher([
+    ('office', ['office']),
+    ('warehouse', ['warehouse']),
+], whole_words=True)
 
 def handle_email(call_sid, speech_result, response):
     """Skip email collection and proceed to next step as requested."""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     session['step'] = 'collect_move_type'
     message = "What type of move? Local, long distance, junk removal, or in-home service?"
     return gather_speech(response, message)
@@ -80,28 +246,20 @@ def handle_email(call_sid, speech_result, response):
 def handle_email_case(call_sid, speech_result, response):
     """Handle email case preference"""
     # Deprecated by per-character email capture; route to next step
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     session['step'] = 'collect_move_type'
     message = "What type of move? Local, long distance, junk removal, or in-home service?"
     return gather_speech(response, message)
 
 def handle_move_type(call_sid, speech_result, response):
     """Handle move type selection"""
-    session = call_sessions[call_sid]
-    
-    # Classify and validate against allowed options
-    user_text = (speech_result or '').lower()
-    classified = (ai_service.classify_move_type(speech_result) or '').lower()
-    candidates = [user_text, classified]
-    normalized = None
-    if any('long distance' in t for t in candidates):
-        normalized = 'Long Distance'
-    elif any('junk' in t for t in candidates):
-        normalized = 'Junk Removal'
-    elif any('in-home' in t or 'in home' in t for t in candidates):
-        normalized = 'In-Home Service'
-    elif any('local' in t for t in candidates):
-        normalized = 'Local'
+    session = session_store[call_sid]
+    
+    # The caller's own words decide; only ask the AI classifier when no keyword matched
+    normalized = _match_move_type((speech_result or '').lower())
+    if not normalized:
+        classified = (ai_service.classify_move_type(speech_result) or '').lower()
+        normalized = _match_move_type(classified)
     
     if not normalized:
         # Re-prompt explicitly when not understood
@@ -122,14 +280,10 @@ def handle_move_type(call_sid, speech_result, response):
 
 def handle_property_type(call_sid, speech_result, response):
     """Handle residential vs commercial"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     text = (speech_result or '').lower()
-    property_type = None
-    if 'residen' in text or 'residential' in text or 'home' in text:
-        property_type = 'residential'
-    elif 'commercial' in text or 'business' in text or 'office' in text or 'warehouse' in text:
-        property_type = 'commercial'
+    property_type = _match_property_type(text)
 
     if not property_type:
         session['step'] = 'collect_property_type'
@@ -146,98 +300,67 @@ def handle_property_type(call_sid, speech_result, response):
     
     return gather_speech(response, message)
 
-def handle_pickup_type(call_sid, speech_result, response):
-    """Handle pickup location type"""
-    session = call_sessions[call_sid]
-    
-    text = (speech_result or '').lower().strip()
-    property_type = session['data'].get('property_type')
-    if not property_type:
-        session['step'] = 'collect_property_type'
-        return gather_speech(response, "Is this residential or commercial?")
-
-    normalized = None
-    if property_type == 'residential':
-        if 'house' in text or 'home' in text:
-            normalized = 'house'
-        elif 'apartment' in text or 'apt' in text or 'condo' in text:
-            normalized = 'apartment'
-    else:
-        if 'office' in text:
-            normalized = 'office'
-        elif 'warehouse' in text:
-            normalized = 'warehouse'
+def _location_type_handler(kind, label):
+    """Build the pickup/drop-off location type handler (kind: session key prefix, label: spoken)"""
+    residential_retry = f"Please say 'house' or 'apartment' for the {label} location."
+    commercial_retry = f"Please say 'office' or 'warehouse' for the {label} location."
+    zip_prompt = f"What's the {label} ZIP code?" + ZIP_HINT
+
+    def handle(call_sid, speech_result, response):
+        session = session_store[call_sid]
+        
+        text = (speech_result or '').lower().strip()
+        property_type = session['data'].get('property_type')
+        if not property_type:
+            session['step'] = 'collect_property_type'
+            return gather_speech(response, "Is this residential or commercial?")
 
-    if not normalized:
-        session['step'] = 'collect_pickup_type'
         if property_type == 'residential':
-            return gather_speech(response, "Please say 'house' or 'apartment' for the pickup location.")
+            normalized = _match_residential_location(text)
         else:
-            return gather_speech(response, "Please say 'office' or 'warehouse' for the pickup location.")
+            normalized = _match_commercial_location(text)
 
-    session['data']['pickup_type'] = normalized
-    session['step'] = 'collect_pickup_address'
-    
-    message = "What's the pickup ZIP code?" + _zip_hint()
-    return gather_speech(response, message)
+        if not normalized:
+            session['step'] = f'collect_{kind}_type'
+            return gather_speech(response, residential_retry if property_type == 'residential' else commercial_retry)
+
+        session['data'][f'{kind}_type'] = normalized
+        session['step'] = f'collect_{kind}_address'
+        return gather_speech(response, zip_prompt, hints=DIGIT_HINTS)
+
+    handle.__doc__ = f"Handle {label} location type"
+    return handle
+
+handle_pickup_type = _location_type_handler('pickup', 'pickup')
 
 def handle_pickup_address(call_sid, speech_result, response):
     """Handle and validate pickup ZIP code (accept per-digit input and accumulate)"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
 
-    buffer = session['data'].get('pickup_zip_buffer', '')
+    buffer = data.get('pickup_zip_buffer', '')
     new_digits = validation_service.extract_digits(speech_result)
     combined = (buffer + (new_digits or ''))[:10]
 
     if len(combined) < 5:
-        session['data']['pickup_zip_buffer'] = combined
-        have = len(combined)
-        message = f"I have {have} digit{'s' if have != 1 else ''}. Please continue with your pickup ZIP code." + _zip_hint()
-        gather = Gather(
-            input='speech dtmf',
-            action='/voice/process',
-            method='POST',
-            timeout=6,
-            speech_timeout='auto',
-            num_digits=5,
-            actionOnEmptyResult=True,
-            finishOnKey='0',
-            language=SPEECH_LANGUAGE,
-            enhanced=SPEECH_ENHANCED,
-            speech_model=SPEECH_MODEL,
-            hints=DEFAULT_HINTS,
-        )
-        gather.say(message, voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        data['pickup_zip_buffer'] = combined
+        message = _PICKUP_ZIP_PROGRESS[len(combined)]
+        return twiml.append_xml(response, twiml.fill_gather(_ZIP_DIGITS_GATHER, message))
 
     zip_code = combined[:5]
-    session['data'].pop('pickup_zip_buffer', None)
-    session['data']['pickup_zip'] = zip_code
-    session['data']['pickup_address'] = zip_code
+    data.pop('pickup_zip_buffer', None)
+    data['pickup_zip'] = zip_code
+    data['pickup_address'] = zip_code
     session['step'] = 'confirm_pickup_address'
 
     spoken = validation_service.digits_to_spoken(zip_code)
     message = f"The pickup ZIP is {spoken}. Correct?"
-    gather = Gather(
-        input='speech dtmf',
-        action='/voice/process',
-        method='POST',
-        timeout=6,
-        speech_timeout='auto',
-        finishOnKey='0',
-        language=SPEECH_LANGUAGE,
-        enhanced=SPEECH_ENHANCED,
-        speech_model=SPEECH_MODEL,
-        hints=DEFAULT_HINTS,
-    )
-    gather.say(message, voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return twiml.append_xml(response, twiml.fill_gather(_ZIP_CONFIRM_GATHER, message))
 
 def handle_confirm_pickup_address(call_sid, speech_result, response):
     """Confirm pickup ZIP"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     
     answer = validation_service.validate_yes_no(speech_result)
     if answer == 'yes':
@@ -247,20 +370,20 @@ def handle_confirm_pickup_address(call_sid, speech_result, response):
     elif answer == 'no':
         # Ask for ZIP again
         session['step'] = 'collect_pickup_address'
-        session['data'].pop('pickup_address', None)
-        session['data'].pop('pickup_zip', None)
-        message = "Let's try again. What's the pickup ZIP code?" + _zip_hint()
-        return gather_speech(response, message)
+        data.pop('pickup_address', None)
+        data.pop('pickup_zip', None)
+        message = _PICKUP_ZIP_RETRY
+        return gather_speech(response, message, hints=DIGIT_HINTS)
     else:
         # Unclear response: repeat confirmation
-        spoken = validation_service.digits_to_spoken(session['data'].get('pickup_zip', ''))
+        spoken = validation_service.digits_to_spoken(data.get('pickup_zip', ''))
         session['step'] = 'confirm_pickup_address'
         message = f"The pickup ZIP is {spoken}. Is that correct?"
         return gather_speech(response, message)
 
 def handle_pickup_rooms(call_sid, speech_result, response):
     """Handle room count at pickup"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     rooms = validation_service.extract_room_count(speech_result)
     
@@ -274,16 +397,17 @@ def handle_pickup_rooms(call_sid, speech_result, response):
     return gather_speech(response, message)
 
 def handle_confirm_pickup_rooms(call_sid, speech_result, response):
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     answer = validation_service.validate_yes_no(speech_result)
     if answer == 'yes':
-        rooms = session['data'].pop('pickup_rooms_candidate', None) or 2
-        session['data']['pickup_rooms'] = rooms
+        rooms = data.pop('pickup_rooms_candidate', None) or 2
+        data['pickup_rooms'] = rooms
         session['step'] = 'collect_pickup_stairs'
         message = f"Got it, {rooms} rooms. Any stairs or elevator at pickup?"
         return gather_speech(response, message)
     elif answer == 'no':
-        session['data'].pop('pickup_rooms_candidate', None)
+        data.pop('pickup_rooms_candidate', None)
         session['step'] = 'collect_pickup_rooms'
         return gather_speech(response, "Okay, how many rooms at pickup? Please say a number from one to ten.")
     else:
@@ -292,7 +416,7 @@ def handle_confirm_pickup_rooms(call_sid, speech_result, response):
 
 def handle_pickup_stairs(call_sid, speech_result, response):
     """Handle stairs/elevator at pickup"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     has_stairs = validation_service._parse_stairs(speech_result)
     session['data']['pickup_stairs'] = 'Yes' if has_stairs else 'No'
@@ -307,140 +431,64 @@ def handle_pickup_stairs(call_sid, speech_result, response):
     
     return gather_speech(response, message)
 
-def handle_dropoff_type(call_sid, speech_result, response):
-    """Handle dropoff location type"""
-    session = call_sessions[call_sid]
-    
-    text = (speech_result or '').lower().strip()
-    property_type = session['data'].get('property_type')
-    if not property_type:
-        session['step'] = 'collect_property_type'
-        return gather_speech(response, "Is this residential or commercial?")
-
-    normalized = None
-    if property_type == 'residential':
-        if 'house' in text or 'home' in text:
-            normalized = 'house'
-        elif 'apartment' in text or 'apt' in text or 'condo' in text:
-            normalized = 'apartment'
-    else:
-        if 'office' in text:
-            normalized = 'office'
-        elif 'warehouse' in text:
-            normalized = 'warehouse'
-
-    if not normalized:
-        session['step'] = 'collect_dropoff_type'
-        if property_type == 'residential':
-            return gather_speech(response, "Please say 'house' or 'apartment' for the drop-off location.")
-        else:
-            return gather_speech(response, "Please say 'office' or 'warehouse' for the drop-off location.")
-
-    session['data']['dropoff_type'] = normalized
-    session['step'] = 'collect_dropoff_address'
-    
-    message = "What's the drop-off ZIP code?" + _zip_hint()
-    return gather_speech(response, message)
+handle_dropoff_type = _location_type_handler('dropoff', 'drop-off')
 
 def handle_dropoff_address(call_sid, speech_result, response):
     """Handle and validate dropoff ZIP code (accept per-digit input and accumulate)"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     
-    buffer = session['data'].get('dropoff_zip_buffer', '')
+    buffer = data.get('dropoff_zip_buffer', '')
     new_digits = validation_service.extract_digits(speech_result)
     combined = (buffer + (new_digits or ''))[:10]
     
     if len(combined) < 5:
-        session['data']['dropoff_zip_buffer'] = combined
-        have = len(combined)
-        message = f"I have {have} digit{'s' if have != 1 else ''}. Please continue with your drop-off ZIP code." + _zip_hint()
-        gather = Gather(
-            input='speech dtmf',
-            action='/voice/process',
-            method='POST',
-            timeout=6,
-            speech_timeout='auto',
-            num_digits=5,
-            actionOnEmptyResult=True,
-            finishOnKey='0',
-            language=SPEECH_LANGUAGE,
-            enhanced=SPEECH_ENHANCED,
-            speech_model=SPEECH_MODEL,
-            hints=DEFAULT_HINTS,
-        )
-        gather.say(message, voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        data['dropoff_zip_buffer'] = combined
+        message = _DROPOFF_ZIP_PROGRESS[len(combined)]
+        return twiml.append_xml(response, twiml.fill_gather(_ZIP_DIGITS_GATHER, message))
     
     zip_code = combined[:5]
-    session['data'].pop('dropoff_zip_buffer', None)
-    session['data']['dropoff_zip'] = zip_code
-    session['data']['dropoff_address'] = zip_code
+    data.pop('dropoff_zip_buffer', None)
+    data['dropoff_zip'] = zip_code
+    data['dropoff_address'] = zip_code
     session['step'] = 'confirm_dropoff_address'
     
     spoken = validation_service.digits_to_spoken(zip_code)
     message = f"Drop-off ZIP is {spoken}. Correct?"
-    gather = Gather(
-        input='speech dtmf',
-        action='/voice/process',
-        method='POST',
-        timeout=6,
-        speech_timeout='auto',
-        finishOnKey='0',
-        language=SPEECH_LANGUAGE,
-        enhanced=SPEECH_ENHANCED,
-        speech_model=SPEECH_MODEL,
-        hints=DEFAULT_HINTS,
-    )
-    gather.say(message, voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return twiml.append_xml(response, twiml.fill_gather(_ZIP_CONFIRM_GATHER, message))
 
 def handle_confirm_dropoff_address(call_sid, speech_result, response):
     """Confirm dropoff ZIP and compute distances if possible"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     
     answer = validation_service.validate_yes_no(speech_result)
     if answer == 'yes':
         session['step'] = 'collect_dropoff_rooms'
-        # Try to compute distances now that we have both ZIPs
-        try:
-            pzip = session['data'].get('pickup_address')
-            dzip = session['data'].get('dropoff_address')
-            if pzip and dzip:
-                dist_info = distance_service.calculate_route_distance(pzip, dzip)
-                if dist_info.get('success'):
-                    # Save both roundtrip and point-to-point for pricing clarity
-                    session['data']['total_distance_roundtrip'] = dist_info.get('total_distance', 0)
-                    session['data']['p2p_distance'] = dist_info.get('p2p_distance', 0)
-                    session['data']['p2d_duration_minutes'] = dist_info.get('p2d_duration_minutes', 0)
-                else:
-                    try:
-                        from utils.logger import logger
-                        logger.warning(f"Call {call_sid} - Distance calc failed at confirm_dropoff: {dist_info.get('error')}")
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        # Look up the route while the caller answers the next questions; handle_time collects it
+        pzip = data.get('pickup_address')
+        dzip = data.get('dropoff_address')
+        if pzip and dzip:
+            _route_futures.put(call_sid, _WARM_POOL.submit(distance_service.calculate_route_distance, pzip, dzip))
         message = "How many rooms at drop-off?"
         return gather_speech(response, message)
     elif answer == 'no':
         # Ask for ZIP again
         session['step'] = 'collect_dropoff_address'
-        session['data'].pop('dropoff_address', None)
-        session['data'].pop('dropoff_zip', None)
-        message = "Let's try again. What's the drop-off ZIP code?" + _zip_hint()
-        return gather_speech(response, message)
+        data.pop('dropoff_address', None)
+        data.pop('dropoff_zip', None)
+        message = _DROPOFF_ZIP_RETRY
+        return gather_speech(response, message, hints=DIGIT_HINTS)
     else:
         # Unclear response: repeat confirmation
-        spoken = validation_service.digits_to_spoken(session['data'].get('dropoff_zip', ''))
+        spoken = validation_service.digits_to_spoken(data.get('dropoff_zip', ''))
         session['step'] = 'confirm_dropoff_address'
         message = f"The drop-off ZIP is {spoken}. Is that correct?"
         return gather_speech(response, message)
 
 def handle_dropoff_rooms(call_sid, speech_result, response):
     """Handle room count at dropoff"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     rooms = validation_service.extract_room_count(speech_result)
     
@@ -454,16 +502,17 @@ def handle_dropoff_rooms(call_sid, speech_result, response):
     return gather_speech(response, message)
 
 def handle_confirm_dropoff_rooms(call_sid, speech_result, response):
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     answer = validation_service.validate_yes_no(speech_result)
     if answer == 'yes':
-        rooms = session['data'].pop('dropoff_rooms_candidate', None) or 2
-        session['data']['dropoff_rooms'] = rooms
+        rooms = data.pop('dropoff_rooms_candidate', None) or 2
+        data['dropoff_rooms'] = rooms
         session['step'] = 'collect_dropoff_stairs'
         message = f"Got it, {rooms} rooms. Any stairs or elevator at drop-off?"
         return gather_speech(response, message)
     elif answer == 'no':
-        session['data'].pop('dropoff_rooms_candidate', None)
+        data.pop('dropoff_rooms_candidate', None)
         session['step'] = 'collect_dropoff_rooms'
         return gather_speech(response, "Okay, how many rooms at drop-off? Please say a number from one to ten.")
     else:
@@ -472,7 +521,7 @@ def handle_confirm_dropoff_rooms(call_sid, speech_result, response):
 
 def handle_dropoff_stairs(call_sid, speech_result, response):
     """Handle stairs/elevator at dropoff"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     has_stairs = validation_service._parse_stairs(speech_result)
     session['data']['dropoff_stairs'] = 'Yes' if has_stairs else 'No'
@@ -483,7 +532,7 @@ def handle_dropoff_stairs(call_sid, speech_result, response):
 
 def handle_date(call_sid, speech_result, response):
     """Handle move date"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     move_date = validation_service.validate_date(speech_result)
     
@@ -491,114 +540,108 @@ def handle_date(call_sid, speech_result, response):
         message = "I didn't understand that date. Please say it again, for example 'January 25th' or 'next Monday'."
         return gather_speech(response, message)
     
+    date_formatted = move_date.strftime('%B %d, %Y')
     session['data']['move_date'] = move_date.strftime('%Y-%m-%d')
-    session['data']['move_date_formatted'] = move_date.strftime('%B %d, %Y')
+    session['data']['move_date_formatted'] = date_formatted
+
+    # Warm bookings cache for the requested date and next 3 days (fast alternatives later)
+    _WARM_POOL.submit(booking_service.get_bookings_for_date_range, move_date, move_date + timedelta(days=3))
 
-    # Warm bookings cache asynchronously to avoid timeouts later
-    def _warm(date_obj):
-        try:
-            bs = BookingService()
-            # Warm requested date and next 3 days for fast alternatives
-            for offset in range(0, 4):
-                bs.get_bookings_for_date(date_obj + timedelta(days=offset))
-            logger.info("Warmed bookings cache for requested date and next 3 days")
-        except Exception as e:
-            logger.error(f"Error warming bookings cache: {e}")
-    try:
-        Thread(target=_warm, args=(move_date,), daemon=True).start()
-    except Exception:
-        pass
     session['step'] = 'collect_time'
     
-    message = f"Great! To confirm, the move date is {move_date.strftime('%B %d, %Y')}. What time would you prefer? You can say morning, afternoon, evening, or a specific time, or flexible."
+    message = f"Great! To confirm, the move date is {date_formatted}. What time would you prefer? You can say morning, afternoon, evening, or a specific time, or flexible."
     return gather_speech(response, message)
 
 def handle_time(call_sid, speech_result, response):
     """Handle move time and check availability"""
     try:
-        session = call_sessions[call_sid]
+        session = session_store[call_sid]
         preferred_time = validation_service.validate_time(speech_result)
         session['data']['move_time'] = preferred_time
-        logger.info(f"Call {call_sid} - Time validated: {preferred_time}")
+        logger.info("Call %s - Time validated: %s", call_sid, preferred_time)
+
+        # Drive time already known (confirm_dropoff_address): check availability now, no redirect hops.
+        # A lookup still running is collected on the check_time hop, after the hold message plays.
+        _collect_route(call_sid, session, wait=False)
+        if session['data'].get('p2d_duration_minutes') is not None:
+            return continue_availability_check(call_sid, response)
 
         # Immediate keep-alive response to avoid Twilio timeout
-        response.say("Thank you. Please hold a moment while I check availability for your preferred time.", voice='Polly.Joanna')
+        _keep_alive(response, _HOLD_URL, "Thank you. Please hold a moment while I check availability for your preferred time.")
         response.pause(length=1)
-        response.say("I'm checking the schedule now. This will just take a few seconds.", voice='Polly.Joanna')
-        base_url = request.url_root.rstrip('/').replace('https://', 'http://')
-        response.redirect(f"{base_url}/voice/check_time", method='POST')
+        _keep_alive(response, _CHECKING_URL, "I'm checking the schedule now. This will just take a few seconds.")
+        response.redirect(CHECK_TIME_URL or f"{_base_url()}/voice/check_time", method='POST')
         return str(response)
 
     except Exception as e:
         logger.error(f"Call {call_sid} - Error in handle_time: {e}", exc_info=True)
         session['step'] = 'collect_packing'
         # Keep caller engaged even on error
-        response.say("Thanks for waiting. Let's continue.", voice='Polly.Joanna')
+        _keep_alive(response, _CONTINUE_URL, "Thanks for waiting. Let's continue.")
         response.pause(length=1)
         fallback_message = "Great! Let me continue. Do you need packing service besides moving?"
         return gather_speech(response, fallback_message)
 
 def continue_time_check(call_sid, response):
     """Stage 1: Quickly compute pickup->dropoff duration, then redirect to availability stage."""
-    from services.distance_service import DistanceService
-
     try:
-        session = call_sessions[call_sid]
-        distance_service = DistanceService()
-
-        # Compute only pickup->dropoff travel time (one API call) for speed
-        p2d_minutes = distance_service.get_pickup_to_dropoff_duration(
-            session['data']['pickup_address'],
-            session['data']['dropoff_address']
-        )
-        session['data']['p2d_duration_minutes'] = p2d_minutes or 0
-        logger.info(f"Call {call_sid} - P2D minutes: {p2d_minutes}")
+        session = session_store[call_sid]
+        data = session['data']
+
+        # Use the lookup started at drop-off confirmation if it's in this worker,
+        # else compute only pickup->dropoff travel time (one API call) for speed
+        _collect_route(call_sid, session)
+        p2d_minutes = data.get('p2d_duration_minutes')
+        if p2d_minutes is None:
+            p2d_minutes = distance_service.get_pickup_to_dropoff_duration(
+                data['pickup_address'],
+                data['dropoff_address']
+            )
+            data['p2d_duration_minutes'] = p2d_minutes or 0
+        logger.info("Call %s - P2D minutes: %s", call_sid, p2d_minutes)
 
         # Keep-alive and move to availability check
-        response.say("Thanks for your patience. I'm checking our crew availability now.", voice='Polly.Joanna')
+        _keep_alive(response, _PATIENCE_URL, "Thanks for your patience. I'm checking our crew availability now.")
         response.pause(length=1)
-        base_url = request.url_root.rstrip('/').replace('https://', 'http://')
-        response.redirect(f"{base_url}/voice/check_availability", method='POST')
+        response.redirect(CHECK_AVAILABILITY_URL or f"{_base_url()}/voice/check_availability", method='POST')
         return str(response)
 
     except Exception as e:
         logger.error(f"Call {call_sid} - Error in continue_time_check (stage1): {e}", exc_info=True)
         session['step'] = 'collect_packing'
-        response.say("Thanks for waiting. Let's continue.", voice='Polly.Joanna')
+        _keep_alive(response, _CONTINUE_URL, "Thanks for waiting. Let's continue.")
         response.pause(length=1)
         fallback_message = "Great! Let me continue. Do you need packing service besides moving?"
         return gather_speech(response, fallback_message)
 
 def continue_availability_check(call_sid, response):
     """Stage 2: Check availability using quick estimated hours and previously computed p2d."""
-    from services.calendar_service import CalendarService
-    from services.distance_service import DistanceService
     from datetime import datetime
 
     try:
-        session = call_sessions[call_sid]
-        calendar_service = CalendarService()
+        session = session_store[call_sid]
+        data = session['data']
 
-        preferred_time = session['data'].get('move_time', 'Flexible')
-        move_type = (session['data'].get('move_type') or '').lower()
+        preferred_time = data.get('move_time', 'Flexible')
+        move_type = (data.get('move_type') or '').lower()
 
         # Quick estimate for job duration
         try:
-            pickup_rooms = int(session['data'].get('pickup_rooms') or 2)
+            pickup_rooms = int(data.get('pickup_rooms') or 2)
         except Exception:
             pickup_rooms = 2
         try:
-            dropoff_rooms = int(session['data'].get('dropoff_rooms') or 2)
+            dropoff_rooms = int(data.get('dropoff_rooms') or 2)
         except Exception:
             dropoff_rooms = 2
         estimated_hours_quick = max(2, (pickup_rooms + dropoff_rooms) / 2)
-        p2d_hours = (session['data'].get('p2d_duration_minutes') or 0) / 60.0
+        p2d_hours = (data.get('p2d_duration_minutes') or 0) / 60.0
         total_needed_hours = max(estimated_hours_quick, p2d_hours)
 
         # Parse date
-        move_date_str = session['data'].get('move_date')
+        move_date_str = data.get('move_date')
         try:
-            move_date_obj = datetime.strptime(move_date_str, '%Y-%m-%d') if move_date_str else None
+            move_date_obj = datetime.fromisoformat(move_date_str) if move_date_str else None
         except Exception:
             move_date_obj = None
 
@@ -610,12 +653,12 @@ def continue_availability_check(call_sid, response):
         if is_long_distance:
             # Skip granular availability; schedule by day and proceed.
             session['step'] = 'collect_packing'
-            date_str = session['data'].get('move_date_formatted') or (move_date_str or '')
+            date_str = data.get('move_date_formatted') or (move_date_str or '')
             msg_intro = f"For long distance moves, we schedule by day and a coordinator will confirm the exact time. "
             if date_str:
                 msg_intro += f"We can place you on the schedule for {date_str}. "
             message = msg_intro + "Do you need packing service besides moving? With packing, we provide boxes of all sizes and all needed packing materials."
-            logger.info(f"Call {call_sid} - Long distance flow: skipping hourly availability and proceeding.")
+            logger.info("Call %s - Long distance flow: skipping hourly availability and proceeding.", call_sid)
             return gather_speech(response, message)
 
         if move_date_obj:
@@ -628,15 +671,16 @@ def continue_availability_check(call_sid, response):
             if availability.get('available'):
                 # Normalize selected time to what's available and ask for confirmation
                 try:
-                    session['data']['move_time'] = availability['time']
-                    # Ensure formatted date is set based on availability date
-                    from datetime import datetime as _dt
-                    session['data']['move_date'] = availability['date']
-                    session['data']['move_date_formatted'] = _dt.strptime(availability['date'], '%Y-%m-%d').strftime('%B %d, %Y')
+                    data['move_time'] = availability['time']
+                    # Ensure formatted date is set based on availability date (re-format only if it moved)
+                    if availability['date'] != data.get('move_date') or not data.get('move_date_formatted'):
+                        from datetime import datetime as _dt
+                        data['move_date'] = availability['date']
+                        data['move_date_formatted'] = _dt.fromisoformat(availability['date']).strftime('%B %d, %Y')
                 except Exception:
                     pass
                 session['step'] = 'confirm_time'
-                message = f"Great! We have availability on {session['data'].get('move_date_formatted', availability['date'])} at {availability['time']}. Is that correct?"
+                message = f"Great! We have availability on {data.get('move_date_formatted', availability['date'])} at {availability['time']}. Is that correct?"
                 return gather_speech(response, message)
             else:
                 alternatives = availability.get('alternatives', [])
@@ -647,7 +691,7 @@ def continue_availability_check(call_sid, response):
                     message = "I'm sorry, that time isn't available. "
                 message += calendar_service.format_alternatives_message(alternatives)
                 session['step'] = 'handle_alternative_selection'
-                logger.info(f"Call {call_sid} - Offering alternatives and awaiting selection")
+                logger.info("Call %s - Offering alternatives and awaiting selection", call_sid)
                 # Use standard gather with fallback + redirect to avoid hangup on silence
                 return gather_speech(response, message)
         else:
@@ -656,88 +700,110 @@ def continue_availability_check(call_sid, response):
         # Proceed to packing question (used when we didn't enter confirm_time path)
         session['step'] = 'collect_packing'
         message += " Do you need packing service besides moving? With packing, we provide boxes of all sizes and all needed packing materials."
-        logger.info(f"Call {call_sid} - Proceeding to packing step. Prompting user.")
+        logger.info("Call %s - Proceeding to packing step. Prompting user.", call_sid)
         result = gather_speech(response, message)
         return result
 
     except Exception as e:
         logger.error(f"Call {call_sid} - Error in continue_availability_check: {e}", exc_info=True)
         session['step'] = 'collect_packing'
-        response.say("Thanks for waiting. Let's continue.", voice='Polly.Joanna')
+        _keep_alive(response, _CONTINUE_URL, "Thanks for waiting. Let's continue.")
         response.pause(length=1)
         fallback_message = "Great! Let me continue. Do you need packing service besides moving?"
         return gather_speech(response, fallback_message)
 
 def handle_packing(call_sid, speech_result, response):
     """Handle packing service"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     answer = validation_service.validate_yes_no(speech_result)
     session['data']['packing_service'] = 'Yes' if answer == 'yes' else 'No'
     session['step'] = 'collect_special_items'
     
-    message = "Understood. Do you have any special items like a piano, safe, or other large items that need extra care?"
+    message = (
+        "Understood. Do you have any special items like a piano, safe, or other large items that need extra care, "
+        "or any other special instructions for the move? You can tell me both together, or say none."
+    )
     return gather_speech(response, message)
 
+_PROCESS_EXPLANATION = """Let me explain our moving process. On moving day, our movers will arrive at your pickup address. 
+        We bring blankets and plastic wrap free of charge to wrap your furniture and prevent any damage to your belongings. 
+        We also bring dollies, free of charge, to ease the movement of furniture, boxes, and any heavy pieces. 
+        We bring tools to disassemble and reassemble required furniture and other pieces such as beds, mirrors, and we can take TVs from walls. 
+        Now, let me provide you with your estimate."""
+
+# Hosted MP3 of _PROCESS_EXPLANATION: played in the Gather instead of synthesizing ~90 words
+PROCESS_EXPLANATION_URL = os.getenv('PROCESS_EXPLANATION_AUDIO_URL') or None
+
+def _render_process_yes():
+    if not PROCESS_EXPLANATION_URL:
+        return gather_speech(VoiceResponse(), _PROCESS_EXPLANATION, action='/voice/estimate')
+    head, tail = _gather_speech_template('/voice/estimate', DEFAULT_HINTS)
+    return twiml.append_xml(VoiceResponse(), f'{head}{twiml.play_xml(PROCESS_EXPLANATION_URL)}{tail}')
+
+# Fixed-text prompts, serialized once to the bytes sent on the wire
+_STATIC_TWIML = {
+    'confirm_time_yes': gather_speech(
+        VoiceResponse(),
+        "Great! Do you need packing service besides moving? With packing, we provide boxes of all sizes and all needed packing materials."
+    ).encode('utf-8'),
+    'confirm_time_no': gather_speech(
+        VoiceResponse(),
+        "No problem. What time would you prefer? You can say morning, afternoon, evening, a specific time, or flexible."
+    ).encode('utf-8'),
+    'special_instructions_prompt': gather_speech(
+        VoiceResponse(), "Thank you. Would you like to know about our moving process before I provide your estimate?"
+    ).encode('utf-8'),
+    'process_yes': _render_process_yes().encode('utf-8'),
+    'process_no': gather_speech(
+        VoiceResponse(), "No problem. Let me provide you with your estimate now.", action='/voice/estimate'
+    ).encode('utf-8'),
+}
+
 def handle_confirm_time(call_sid, speech_result, response):
     """Confirm the selected move time before proceeding."""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
+    data = session['data']
     answer = validation_service.validate_yes_no(speech_result or '')
-    date_str = session['data'].get('move_date_formatted') or session['data'].get('move_date') or ''
-    time_str = session['data'].get('move_time') or ''
 
     if answer == 'yes':
         session['step'] = 'collect_packing'
-        message = "Great! Do you need packing service besides moving? With packing, we provide boxes of all sizes and all needed packing materials."
-        return gather_speech(response, message)
+        return _STATIC_TWIML['confirm_time_yes']
     elif answer == 'no':
         session['step'] = 'collect_time'
-        message = "No problem. What time would you prefer? You can say morning, afternoon, evening, a specific time, or flexible."
-        return gather_speech(response, message)
+        return _STATIC_TWIML['confirm_time_no']
     else:
         session['step'] = 'confirm_time'
+        date_str = data.get('move_date_formatted') or data.get('move_date') or ''
+        time_str = data.get('move_time') or ''
         message = f"To confirm, your move time is {time_str} on {date_str}. Is that correct?"
         return gather_speech(response, message)
 
 def handle_special_items(call_sid, speech_result, response):
-    """Handle special items"""
-    session = call_sessions[call_sid]
+    """Handle special items and instructions (asked together in one prompt)"""
+    session = session_store[call_sid]
     
     session['data']['special_items'] = speech_result.strip()
-    session['step'] = 'collect_special_instructions'
-    
-    message = "Got it. Do you have any other special instructions or requirements for the move?"
-    return gather_speech(response, message)
+    session['step'] = 'ask_process_explanation'
+    prefetch_weekly_bookings(call_sid, session['data'].get('move_date'))
+    return _STATIC_TWIML['special_instructions_prompt']
 
 def handle_special_instructions(call_sid, speech_result, response):
-    """Handle special instructions"""
-    session = call_sessions[call_sid]
+    """Handle special instructions (calls still on the old separate step)"""
+    session = session_store[call_sid]
     
     session['data']['special_instructions'] = speech_result.strip()
     session['step'] = 'ask_process_explanation'
-    
-    message = "Thank you. Would you like to know about our moving process before I provide your estimate?"
-    return gather_speech(response, message)
+    prefetch_weekly_bookings(call_sid, session['data'].get('move_date'))
+    return _STATIC_TWIML['special_instructions_prompt']
 
 def handle_ask_process_explanation(call_sid, speech_result, response):
     """Handle process explanation request - ask yes/no"""
-    session = call_sessions[call_sid]
+    session = session_store[call_sid]
     
     answer = validation_service.validate_yes_no(speech_result)
-    
-    if answer == 'yes':
-        message = """Let me explain our moving process. On moving day, our movers will arrive at your pickup address. 
-        We bring blankets and plastic wrap free of charge to wrap your furniture and prevent any damage to your belongings. 
-        We also bring dollies, free of charge, to ease the movement of furniture, boxes, and any heavy pieces. 
-        We bring tools to disassemble and reassemble required furniture and other pieces such as beds, mirrors, and we can take TVs from walls. 
-        Now, let me provide you with your estimate."""
-        session['step'] = 'provide_estimate'
-    else:
-        message = "No problem. Let me provide you with your estimate now."
-        session['step'] = 'provide_estimate'
-    
-    return gather_speech(response, message, action='/voice/estimate')
+    session['step'] = 'provide_estimate'
+    return _STATIC_TWIML['process_yes' if answer == 'yes' else 'process_no']
 
-def handle_process_explanation(call_sid, speech_result, response):
-    """Handle process explanation (deprecated - use handle_ask_process_explanation)"""
-    return handle_ask_process_explanation(call_sid, speech_result, response)
\ No newline at end of file
+# Deprecated name for handle_ask_process_explanation (legacy 'explain_process' step)
+handle_process_explanation = handle_ask_process_explanation
\ No newline at end of file
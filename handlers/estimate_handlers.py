@@ -1,5 +1,7 @@
 from twilio.twiml.voice_response import VoiceResponse, Gather
+import functools
 import os
+from config import Config
 from services.pricing_service import PricingService
 from services.booking_service import BookingService
 from services.calendar_service import CalendarService
@@ -8,8 +10,11 @@ from services.sms_service import SMSService
 from services.email_service import EmailService
 from services.long_distance_service import LongDistanceService
 from services.validation_service import ValidationService
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from utils.logger import logger
+from utils import twiml
+from handlers import conversation_handlers as conv_handlers
 
 pricing_service = PricingService()
 booking_service = BookingService()
@@ -20,8 +25,22 @@ email_service = EmailService()
 long_distance_service = LongDistanceService()
 validation_service = ValidationService()
 
-# This will be set by app.py
-call_sessions = {}
+# Notification sends (Twilio/SMTP round trips); worker threads start on first submit
+_NOTIFY_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='estimate-notify')
+
+def _log_notify_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"Background notification failed: {exc}")
+
+def _notify(send, *args):
+    """Run an SMS/email send in the background so the TwiML goes back right away"""
+    _NOTIFY_POOL.submit(send, *args).add_done_callback(_log_notify_failure)
+
+def _send_booking_email(data):
+    """Email the manager, then mark the booking row once the email has actually gone out"""
+    if email_service.send_manager_booking_notification(data):
+        booking_service.mark_confirmation_sent(data['booking_id'])
 
 # Twilio Speech Recognition tuning (env-configurable)
 SPEECH_LANGUAGE = os.getenv('TWILIO_SPEECH_LANGUAGE', 'en-US')
@@ -33,28 +52,55 @@ DEFAULT_HINTS = os.getenv(
     'morning,afternoon,evening,flexible,one,two,three,four,five,six,seven,eight,nine,zero,oh,o,zip,zip code,from,to'
 )
 
+# Gather attributes that never vary (ASR tuning + hints), built once
+_BASE_GATHER_KWARGS = dict(
+    language=SPEECH_LANGUAGE,
+    enhanced=SPEECH_ENHANCED,
+    speech_model=SPEECH_MODEL,
+    hints=DEFAULT_HINTS,
+)
+
 def _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', num_digits=None, action_on_empty=True):
     kwargs = dict(
+        _BASE_GATHER_KWARGS,
         input=input_types,
         action=action,
         method=method,
         timeout=timeout,
         speech_timeout=speech_timeout,
-        language=SPEECH_LANGUAGE,
-        enhanced=SPEECH_ENHANCED,
-        speech_model=SPEECH_MODEL,
-        hints=DEFAULT_HINTS,
         actionOnEmptyResult=action_on_empty
     )
     if num_digits is not None:
         kwargs['num_digits'] = num_digits
     return Gather(**kwargs)
 
+@functools.lru_cache(maxsize=64)
+def _gather_template(input_types, action, timeout, num_digits):
+    return twiml.gather_template(_make_gather(input_types=input_types, action=action, timeout=timeout, num_digits=num_digits))
+
+@functools.lru_cache(maxsize=32)
+def _silence_fallback(message, action):
+    """Say + Redirect played if the caller stays silent, rendered once per prompt"""
+    fallback = VoiceResponse()
+    fallback.say(message, voice='Polly.Joanna')
+    fallback.redirect(action, method='POST')
+    return twiml.fragment_xml(fallback)
+
+def _gather_say(response, message, input_types='speech', action='/voice/process', timeout=5, num_digits=None, fallback=None):
+    """Append a Gather prompting `message`, filled into a Gather rendered once per shape"""
+    fragment = twiml.fill_gather(_gather_template(input_types, action, timeout, num_digits), message)
+    if fallback:
+        fragment += _silence_fallback(fallback, action)
+    return twiml.append_xml(response, fragment)
+
 def provide_estimate(call_sid, session, response):
     """Calculate and provide estimate to customer"""
     
     data = session['data']
     
+    # Count the week's bookings alongside the route lookup (no-op if already prefetched)
+    conv_handlers.prefetch_weekly_bookings(call_sid, data['move_date'])
+    
     # Ensure we have point-to-point distance (pickup->dropoff) for pricing
     try:
         p = data.get('pickup_address')
@@ -68,10 +114,11 @@ def provide_estimate(call_sid, session, response):
     except Exception:
         pass
     
-    # Get weekly bookings count for pricing tier
-    move_date = datetime.strptime(data['move_date'], '%Y-%m-%d')
-    week_start = move_date - timedelta(days=move_date.weekday())
-    weekly_bookings = booking_service.count_weekly_bookings(week_start)
+    # Get weekly bookings count for pricing tier (counted here if the background count failed)
+    week_start = conv_handlers.move_week_start(data['move_date'])
+    weekly_bookings = conv_handlers.take_weekly_bookings(call_sid, week_start)
+    if weekly_bookings is None:
+        weekly_bookings = booking_service.count_weekly_bookings(week_start)
     
     # Calculate estimate using point-to-point miles for mileage charges
     distance_for_pricing = data.get('p2p_distance', data.get('total_distance', 0))
@@ -83,8 +130,9 @@ def provide_estimate(call_sid, session, response):
     # Check if requires manual quote (long distance)
     if estimate.get('requires_manual_quote'):
         # Notify manager with details
-        long_distance_service.request_long_distance_quote(
-            data,
+        _notify(
+            long_distance_service.request_long_distance_quote,
+            dict(data),
             data.get('p2p_distance', data.get('total_distance', 0))
         )
 
@@ -95,13 +143,8 @@ def provide_estimate(call_sid, session, response):
         )
         session['step'] = 'handle_inhouse_estimate'
 
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say(message, voice='Polly.Joanna')
-        response.append(gather)
         # Fallback to avoid hangup on silence
-        response.say("I didn't catch that. Would you like an in-house estimate?", voice='Polly.Joanna')
-        response.redirect('/voice/process', method='POST')
-        return str(response)
+        return _gather_say(response, message, timeout=6, fallback="I didn't catch that. Would you like an in-house estimate?")
     
     # Format estimate message
     estimate_message = pricing_service.format_estimate_message(estimate)
@@ -131,20 +174,44 @@ def provide_estimate(call_sid, session, response):
     
     session['step'] = 'confirm_booking'
     
-    gather = _make_gather(input_types='speech', action='/voice/confirm_booking', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say(message, voice='Polly.Joanna')
-    response.append(gather)
     # Fallback to avoid hangup on silence
-    response.say("I didn't catch that. Let's confirm your booking.", voice='Polly.Joanna')
-    response.redirect('/voice/confirm_booking', method='POST')
-    
-    return str(response)
+    return _gather_say(response, message, action='/voice/confirm_booking', fallback="I didn't catch that. Let's confirm your booking.")
+
+@functools.lru_cache(maxsize=256)
+def _window_phrase(time_str):
+    """Arrival window for the confirmation (1-hour morning, 2-hour afternoon), memoized per move_time"""
+    try:
+        t = (time_str or '').strip()
+        if not t:
+            return ''
+        tl = t.lower()
+        if 'morning' in tl:
+            return "with a one-hour window (9-10 AM)"
+        if 'afternoon' in tl:
+            return "with a two-hour window (1-3 PM)"
+        if 'flexible' in tl:
+            return ''
+        # Try parse like '9 AM' or '1 PM'
+        parts = t.replace('.', '').upper().split()
+        hour = int(parts[0]) if parts else 9
+        if 'PM' in t.upper():
+            if hour < 12:
+                hour += 12
+        # Morning vs afternoon window
+        if hour < 12:
+            return "with a one-hour window"
+        else:
+            # Build explicit window e.g., 13 -> 1-3 PM
+            def _fmt(h):
+                return "12" if h == 12 else f"{h-12}"
+            start = hour
+            end = hour + 2
+            return f"with a two-hour window ({_fmt(start)}-{_fmt(end)} PM)"
+    except Exception:
+        return ''
 
 def confirm_booking(call_sid, session, speech_result, response):
     """Handle booking confirmation"""
-    from services.validation_service import ValidationService
-    
-    validation_service = ValidationService()
     answer = validation_service.validate_yes_no(speech_result)
     
     if answer == 'yes':
@@ -154,50 +221,15 @@ def confirm_booking(call_sid, session, speech_result, response):
         data['status'] = 'Confirmed'
         data['confirmation_sent'] = 'No'
         
+        # Appended with Confirmation Sent = No; the background email marks it Yes once it succeeds
         booking_id = booking_service.save_booking(data, call_sid)
         
         if booking_id:
             data['booking_id'] = booking_id
             # Send manager notification email only (no SMS to customer, no waiting for replies)
-            try:
-                email_service.send_manager_booking_notification(data)
-                data['confirmation_sent'] = 'Yes'
-            except Exception as e:
-                logger.error(f"Error sending manager email: {e}")
+            _notify(_send_booking_email, dict(data))
             
             # Success message
-            # Compute window phrase for confirmation (1-hour morning, 2-hour afternoon)
-            def _window_phrase(time_str):
-                try:
-                    t = (time_str or '').strip()
-                    if not t:
-                        return ''
-                    tl = t.lower()
-                    if 'morning' in tl:
-                        return "with a one-hour window (9-10 AM)"
-                    if 'afternoon' in tl:
-                        return "with a two-hour window (1-3 PM)"
-                    if 'flexible' in tl:
-                        return ''
-                    # Try parse like '9 AM' or '1 PM'
-                    parts = t.replace('.', '').upper().split()
-                    hour = int(parts[0]) if parts else 9
-                    if 'PM' in t.upper():
-                        if hour < 12:
-                            hour += 12
-                    # Morning vs afternoon window
-                    if hour < 12:
-                        return "with a one-hour window"
-                    else:
-                        # Build explicit window e.g., 13 -> 1-3 PM
-                        def _fmt(h):
-                            return "12" if h == 12 else f"{h-12}"
-                        start = hour
-                        end = hour + 2
-                        return f"with a two-hour window ({_fmt(start)}-{_fmt(end)} PM)"
-                except Exception:
-                    return ''
-
             window_text = _window_phrase(data.get('move_time'))
             message = (
                 f"Perfect! Your move is confirmed for {data.get('move_date_formatted')} at {data.get('move_time')} {window_text}. "
@@ -217,37 +249,44 @@ def confirm_booking(call_sid, session, speech_result, response):
             "No problem. If you'd like, I can connect you with our manager to see if we can offer a discount. "
             "Would you like me to transfer you now?"
         )
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say(prompt, voice='Polly.Joanna')
-        response.append(gather)
         # Fallback on silence
-        response.say("I didn't catch that. Should I transfer you to our manager?", voice='Polly.Joanna')
-        response.redirect('/voice/process', method='POST')
-        return str(response)
+        return _gather_say(response, prompt, fallback="I didn't catch that. Should I transfer you to our manager?")
     
     return str(response)
 
 def _compose_estimate_sms(session):
     data = session['data']
     est = session.get('estimate', {})
+    return _estimate_sms_text(
+        data.get('booking_id'),
+        data.get('name'),
+        data.get('move_date_formatted') or data.get('move_date'),
+        data.get('move_time'),
+        data.get('pickup_address'),
+        data.get('dropoff_address'),
+        data.get('total_estimate') or est.get('total_estimate'),
+        data.get('movers_needed') or est.get('movers_needed'),
+        data.get('estimated_hours') or est.get('estimated_hours'),
+    )
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _estimate_sms_text(booking_id, name, date, time, pickup, dropoff, total, movers, hours):
+    """Estimate SMS body (memoized on the fields: resends reuse the same text)"""
     parts = []
     parts.append("USF Moving - Booking Confirmed")
-    if data.get('booking_id'):
-        parts.append(f"Booking ID: {data['booking_id']}")
-    if data.get('name'):
-        parts.append(f"Name: {data['name']}")
-    if data.get('move_date_formatted') or data.get('move_date'):
-        parts.append(f"Date: {data.get('move_date_formatted') or data.get('move_date')}")
-    if data.get('move_time'):
-        parts.append(f"Time: {data.get('move_time')}")
-    if data.get('pickup_address'):
-        parts.append(f"Pickup: {data.get('pickup_address')}")
-    if data.get('dropoff_address'):
-        parts.append(f"Drop-off: {data.get('dropoff_address')}")
+    if booking_id:
+        parts.append(f"Booking ID: {booking_id}")
+    if name:
+        parts.append(f"Name: {name}")
+    if date:
+        parts.append(f"Date: {date}")
+    if time:
+        parts.append(f"Time: {time}")
+    if pickup:
+        parts.append(f"Pickup: {pickup}")
+    if dropoff:
+        parts.append(f"Drop-off: {dropoff}")
     # Estimate summary
-    total = data.get('total_estimate') or est.get('total_estimate')
-    movers = data.get('movers_needed') or est.get('movers_needed')
-    hours = data.get('estimated_hours') or est.get('estimated_hours')
     if movers:
         parts.append(f"Crew: {movers} movers")
     if hours:
@@ -262,16 +301,10 @@ def handle_final_pickup_address(call_sid, session, speech_result, response):
     candidate = (speech_result or '').strip()
     if not candidate or len(candidate) < 5:
         session['step'] = 'collect_final_pickup_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say("I didn't catch that. Please say the full pickup address, including city and ZIP.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "I didn't catch that. Please say the full pickup address, including city and ZIP.", timeout=6)
     data['pickup_address_candidate'] = candidate
     session['step'] = 'confirm_final_pickup_address'
-    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say(f"You said, {candidate}. Is that correct?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_say(response, f"You said, {candidate}. Is that correct?")
 
 def handle_confirm_final_pickup_address(call_sid, session, speech_result, response):
     ans = validation_service.validate_yes_no(speech_result or '')
@@ -288,39 +321,24 @@ def handle_confirm_final_pickup_address(call_sid, session, speech_result, respon
             final_addr = f"{cand}, {hint}" if hint else (cand or '')
         data['pickup_address'] = final_addr
         session['step'] = 'collect_final_dropoff_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say("Thanks. What's the full drop-off address, including city and ZIP?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Thanks. What's the full drop-off address, including city and ZIP?", timeout=6)
     elif ans == 'no':
         data.pop('pickup_address_candidate', None)
         session['step'] = 'collect_final_pickup_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say("Let's try again. What's the full pickup address?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Let's try again. What's the full pickup address?", timeout=6)
     else:
         session['step'] = 'confirm_final_pickup_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Is that pickup address correct?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Is that pickup address correct?")
 
 def handle_final_dropoff_address(call_sid, session, speech_result, response):
     data = session['data']
     candidate = (speech_result or '').strip()
     if not candidate or len(candidate) < 5:
         session['step'] = 'collect_final_dropoff_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say("I didn't catch that. Please say the full drop-off address, including city and ZIP.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "I didn't catch that. Please say the full drop-off address, including city and ZIP.", timeout=6)
     data['dropoff_address_candidate'] = candidate
     session['step'] = 'confirm_final_dropoff_address'
-    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say(f"You said, {candidate}. Is that correct?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_say(response, f"You said, {candidate}. Is that correct?")
 
 def handle_confirm_final_dropoff_address(call_sid, session, speech_result, response):
     ans = validation_service.validate_yes_no(speech_result or '')
@@ -336,37 +354,23 @@ def handle_confirm_final_dropoff_address(call_sid, session, speech_result, respo
             hint = data.get('dropoff_zip')
             final_addr = f"{cand}, {hint}" if hint else (cand or '')
         data['dropoff_address'] = final_addr
-        # Send estimate SMS to customer and manager, then confirm receipt
+        # Send estimate SMS to customer and manager, then confirm receipt.
+        # Re-confirming the same address doesn't send it again; explicit resends below still do.
         sms_text = _compose_estimate_sms(session)
-        try:
-            phone = data.get('phone')
-            if phone:
-                sms_service.send_sms(phone, sms_text)
-        except Exception as e:
-            logger.error(f"Error sending SMS to customer: {e}")
-        try:
-            # Manager line for transfer reference
-            sms_service.send_sms('+18327999276', sms_text)
-        except Exception:
-            pass
+        phone = data.get('phone')
+        if phone:
+            _notify(sms_service.send_sms_once, phone, sms_text)
+        # Manager line for transfer reference
+        _notify(sms_service.send_sms_once, Config.MANAGER_PHONE, sms_text)
         session['step'] = 'confirm_sms_received'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("I've sent your estimate by text. Did you receive it?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "I've sent your estimate by text. Did you receive it?")
     elif ans == 'no':
         data.pop('dropoff_address_candidate', None)
         session['step'] = 'collect_final_dropoff_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', action_on_empty=True)
-        gather.say("Let's try again. What's the full drop-off address?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Let's try again. What's the full drop-off address?", timeout=6)
     else:
         session['step'] = 'confirm_final_dropoff_address'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Is that drop-off address correct?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Is that drop-off address correct?")
 
 def handle_confirm_sms_received(call_sid, session, speech_result, response):
     ans = validation_service.validate_yes_no(speech_result or '')
@@ -380,19 +384,12 @@ def handle_confirm_sms_received(call_sid, session, speech_result, response):
         session['step'] = 'confirm_phone_for_sms'
         phone_digits = validation_service.extract_digits(data.get('phone', '') or '')
         spoken = validation_service.digits_to_spoken(phone_digits)
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
         if spoken:
-            gather.say(f"Let's confirm your number. Is your phone number {spoken}?", voice='Polly.Joanna')
-        else:
-            gather.say("Let's confirm your number. Is the phone number I have on file correct?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+            return _gather_say(response, f"Let's confirm your number. Is your phone number {spoken}?")
+        return _gather_say(response, "Let's confirm your number. Is the phone number I have on file correct?")
     else:
         session['step'] = 'confirm_sms_received'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Did you receive the text message?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Did you receive the text message?")
 
 def handle_confirm_phone_for_sms(call_sid, session, speech_result, response):
     ans = validation_service.validate_yes_no(speech_result or '')
@@ -400,57 +397,32 @@ def handle_confirm_phone_for_sms(call_sid, session, speech_result, response):
     if ans == 'yes':
         # Resend SMS
         sms_text = _compose_estimate_sms(session)
-        try:
-            sms_service.send_sms(data.get('phone'), sms_text)
-        except Exception as e:
-            logger.error(f"Error resending SMS: {e}")
+        _notify(sms_service.send_sms, data.get('phone'), sms_text)
         session['step'] = 'confirm_sms_received'
-        gather = Gather(input='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', actionOnEmptyResult=True)
-        gather.say("I've resent the message. Did you receive it now?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "I've resent the message. Did you receive it now?")
     elif ans == 'no':
         session['step'] = 'collect_phone_for_sms'
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', num_digits=14, action_on_empty=True)
-        gather.say("Please say your phone number so I can resend your estimate.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Please say your phone number so I can resend your estimate.", input_types='speech dtmf', timeout=6, num_digits=14)
     else:
         session['step'] = 'confirm_phone_for_sms'
-        gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-        gather.say("Is your phone number correct?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Is your phone number correct?")
 
 def handle_collect_phone_for_sms(call_sid, session, speech_result, response):
     data = session['data']
     digits = validation_service.extract_digits(speech_result or '')
     if not digits or len(digits) < 10:
         session['step'] = 'collect_phone_for_sms'
-        gather = _make_gather(input_types='speech dtmf', action='/voice/process', method='POST', timeout=6, speech_timeout='auto', num_digits=14, action_on_empty=True)
-        gather.say("I didn't catch enough digits. Please say your phone number again.", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "I didn't catch enough digits. Please say your phone number again.", input_types='speech dtmf', timeout=6, num_digits=14)
     phone_fmt = validation_service.format_phone(digits)
     data['phone'] = phone_fmt
     # Send SMS now and confirm
     sms_text = _compose_estimate_sms(session)
-    try:
-        sms_service.send_sms(data.get('phone'), sms_text)
-    except Exception as e:
-        logger.error(f"Error sending SMS after phone update: {e}")
+    _notify(sms_service.send_sms, data.get('phone'), sms_text)
     session['step'] = 'confirm_sms_received'
-    gather = _make_gather(input_types='speech', action='/voice/process', method='POST', timeout=5, speech_timeout='auto', action_on_empty=True)
-    gather.say("Thanks. I have sent the text. Did you receive it?", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_say(response, "Thanks. I have sent the text. Did you receive it?")
 
 def handle_alternative_selection(call_sid, session, speech_result, response):
     """Handle selection of alternative time slot"""
-    from services.validation_service import ValidationService
-    
-    validation_service = ValidationService()
-    
     # Parse which alternative they selected
     alternatives = session.get('alternatives', [])
     
@@ -478,62 +450,28 @@ def handle_alternative_selection(call_sid, session, speech_result, response):
         session['data']['move_date'] = selected['date']
         session['data']['move_time'] = selected['time']
 
-        date_obj = datetime.strptime(selected['date'], '%Y-%m-%d')
-        date_str = date_obj.strftime('%B %d, %Y')
+        # Spoken form is built with the alternatives; older sessions may lack it
+        date_str = selected.get('date_formatted') or datetime.strptime(selected['date'], '%Y-%m-%d').strftime('%B %d, %Y')
         session['data']['move_date_formatted'] = date_str
 
         # Route to confirm_time to keep behavior consistent
         session['step'] = 'confirm_time'
         message = f"Great! We can schedule your move for {date_str} at {selected['time']}. Is that correct?"
-        gather = _make_gather(
-            input_types='speech',
-            action='/voice/process',
-            method='POST',
-            timeout=5,
-            speech_timeout='auto',
-            action_on_empty=True
-        )
-        gather.say(message, voice='Polly.Joanna')
-        response.append(gather)
         # Fallback to avoid hangup on silence
-        response.say("I didn't catch that. Is the date and time I suggested okay?", voice='Polly.Joanna')
-        response.redirect('/voice/process', method='POST')
-        return str(response)
+        return _gather_say(response, message, fallback="I didn't catch that. Is the date and time I suggested okay?")
     else:
         # Couldn't understand selection, re-prompt without auto-transfer
         message = "I didn't catch which option you chose. You can say 'first', 'second', or 'third'. Which one would you like?"
         session['step'] = 'handle_alternative_selection'
-        gather = Gather(
-            input='speech',
-            action='/voice/process',
-            method='POST',
-            timeout=5,
-            speech_timeout='auto'
-        )
-        gather.say(message, voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, message)
     
     # If we couldn't parse a valid choice, we already returned above. As a safe fallback,
     # re-prompt the alternatives selection.
     session['step'] = 'handle_alternative_selection'
-    gather = _make_gather(
-        input_types='speech',
-        action='/voice/process',
-        method='POST',
-        timeout=5,
-        speech_timeout='auto',
-        action_on_empty=True
-    )
-    gather.say("Please say 'first', 'second', or 'third' to pick a time.", voice='Polly.Joanna')
-    response.append(gather)
-    return str(response)
+    return _gather_say(response, "Please say 'first', 'second', or 'third' to pick a time.")
 
 def handle_callback_request(call_sid, session, speech_result, response):
     """Handle callback request for long distance moves"""
-    from services.validation_service import ValidationService
-    
-    validation_service = ValidationService()
     answer = validation_service.validate_yes_no(speech_result)
     
     data = session['data']
@@ -576,8 +514,6 @@ USF Moving Company"""
 
 def handle_inhouse_estimate(call_sid, session, speech_result, response):
     """Handle customer's choice for an in-house (on-site) estimate for long distance moves"""
-    from services.validation_service import ValidationService
-    validation_service = ValidationService()
     answer = validation_service.validate_yes_no(speech_result)
 
     data = session['data']
@@ -606,33 +542,11 @@ def handle_inhouse_estimate(call_sid, session, speech_result, response):
         prompt = (
             "No problem. Would you like me to have someone call you back within 24 hours with a custom long distance quote?"
         )
-        gather = Gather(
-            input='speech',
-            action='/voice/confirm_callback',
-            method='POST',
-            timeout=5,
-            speech_timeout='auto',
-            actionOnEmptyResult=True
-        )
-        gather.say(prompt, voice='Polly.Joanna')
-        response.append(gather)
-        response.say("I didn't catch that. Let's confirm by phone.", voice='Polly.Joanna')
-        response.redirect('/voice/confirm_callback', method='POST')
-        return str(response)
+        return _gather_say(response, prompt, action='/voice/confirm_callback', fallback="I didn't catch that. Let's confirm by phone.")
     else:
         # Re-prompt
         session['step'] = 'handle_inhouse_estimate'
-        gather = Gather(
-            input='speech',
-            action='/voice/process',
-            method='POST',
-            timeout=5,
-            speech_timeout='auto',
-            actionOnEmptyResult=True
-        )
-        gather.say("Would you like us to send someone to your pickup address for a free in-house estimate?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
+        return _gather_say(response, "Would you like us to send someone to your pickup address for a free in-house estimate?")
 
 def handle_discount_offer(call_sid, session, speech_result, response):
     """Handle discount offer by transferring to manager if agreed"""
@@ -645,7 +559,7 @@ def handle_discount_offer(call_sid, session, speech_result, response):
         data['status'] = 'Transfer to Manager - Discount'
         booking_service.save_booking(data, call_sid)
         response.say("I'll transfer you to our manager now. Please hold.", voice='Polly.Joanna')
-        response.dial('+18327999276')
+        response.dial(Config.MANAGER_PHONE)
         return str(response)
     elif answer == 'no':
         # Save lead and end politely
@@ -661,14 +575,4 @@ def handle_discount_offer(call_sid, session, speech_result, response):
     else:
         # Re-prompt
         session['step'] = 'handle_discount_offer'
-        gather = Gather(
-            input='speech',
-            action='/voice/process',
-            method='POST',
-            timeout=5,
-            speech_timeout='auto',
-            actionOnEmptyResult=True
-        )
-        gather.say("Would you like me to transfer you to our manager to check a discount?", voice='Polly.Joanna')
-        response.append(gather)
-        return str(response)
\ No newline at end of file
+        return _gather_say(response, "Would you like me to transfer you to our manager to check a discount?")
\ No newline at end of file
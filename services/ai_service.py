@@ -1,23 +1,51 @@
 # OpenAI integration
-import openai
+import functools
+from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Short labels/names on the call path use a small fast model; free text gets the larger one
+CLASSIFY_MODEL = os.getenv('OPENAI_CLASSIFY_MODEL', 'gpt-4o-mini')
+COMPOSE_MODEL = os.getenv('OPENAI_COMPOSE_MODEL', 'gpt-4o')
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT_SECONDS', 10))
+
+# One client per process: its HTTP pool keeps the TLS connection to OpenAI alive between turns
+_client = None
+
+
+def get_openai_client():
+    """Shared OpenAI client (raises if OPENAI_API_KEY is missing)"""
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=OPENAI_TIMEOUT, max_retries=1)
+    return _client
+
+
 class AIService:
     def __init__(self):
-        openai.api_key = os.getenv('OPENAI_API_KEY')
-        self.model = "gpt-4"
+        self.classify_model = CLASSIFY_MODEL
+        self.compose_model = COMPOSE_MODEL
+        self.timeout = OPENAI_TIMEOUT
+    
+    @property
+    def client(self):
+        """Shared OpenAI client (raises if OPENAI_API_KEY is missing)"""
+        return get_openai_client()
+    
+    def warm_up(self):
+        """Open the connection to OpenAI ahead of the first caller (no tokens used)"""
+        try:
+            self.client.models.retrieve(self.classify_model)
+        except Exception as e:
+            print(f"Error warming up OpenAI client: {e}")
     
     def detect_intent(self, user_input):
         """Detect user intent from speech"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
+            response = self.client.chat.completions.create(
+                model=self.classify_model,
                 messages=[
                     {
                         "role": "system",
@@ -29,7 +57,7 @@ class AIService:
                     }
                 ],
                 max_tokens=10,
-                temperature=0.3
+                temperature=0
             )
             
             intent = response.choices[0].message.content.strip().lower()
@@ -50,11 +78,8 @@ class AIService:
             
             system_prompt = system_prompts.get(context, system_prompts["general"])
             
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
+            response = self.client.chat.completions.create(
+                model=self.compose_model,
                 messages=[
                     {
                         "role": "system",
@@ -98,11 +123,8 @@ class AIService:
             Keep it concise and professional.
             """
             
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
+            response = self.client.chat.completions.create(
+                model=self.compose_model,
                 messages=[
                     {
                         "role": "system",
@@ -152,11 +174,8 @@ https://www.usfhoustonmoving.com/
     def classify_move_type(self, user_input):
         """Classify the type of move from user input"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
+            response = self.client.chat.completions.create(
+                model=self.classify_model,
                 messages=[
                     {
                         "role": "system",
@@ -168,7 +187,7 @@ https://www.usfhoustonmoving.com/
                     }
                 ],
                 max_tokens=10,
-                temperature=0.2
+                temperature=0
             )
             
             move_type = response.choices[0].message.content.strip().strip("'\"")
@@ -181,27 +200,8 @@ https://www.usfhoustonmoving.com/
     def extract_name(self, user_input):
         """Extract person's name from speech input"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Extract only the person's name from the user's speech. If they say 'my name is John Doe' or 'I am John Doe' or 'this is John Doe', return only 'John Doe'. If they just say 'John Doe', return 'John Doe'. Return only the name in proper title case, nothing else."
-                    },
-                    {
-                        "role": "user",
-                        "content": user_input
-                    }
-                ],
-                max_tokens=20,
-                temperature=0.2
-            )
-            
-            name = response.choices[0].message.content.strip()
-            return name
+            # Callers often repeat their name; identical utterances hit the cache
+            return _extract_name_ai(' '.join(user_input.split()))
         
         except Exception as e:
             print(f"Error extracting name: {e}")
@@ -214,4 +214,26 @@ https://www.usfhoustonmoving.com/
             elif 'this is' in lower_input:
                 return user_input.split('this is', 1)[1].strip().title()
             else:
-                return user_input.strip().title()
\ No newline at end of file
+                return user_input.strip().title()
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_name_ai(user_input):
+    """Ask the model for the name (memoized per normalized utterance; failed calls are not cached)"""
+    response = get_openai_client().chat.completions.create(
+        model=CLASSIFY_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "Extract only the person's name from the user's speech. If they say 'my name is John Doe' or 'I am John Doe' or 'this is John Doe', return only 'John Doe'. If they just say 'John Doe', return 'John Doe'. Return only the name in proper title case, nothing else."
+            },
+            {
+                "role": "user",
+                "content": user_input
+            }
+        ],
+        max_tokens=20,
+        temperature=0
+    )
+    
+    return response.choices[0].message.content.strip()
\ No newline at end of file
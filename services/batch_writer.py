@@ -0,0 +1,90 @@
+# Write-behind buffer: one background thread flushes queued items in batches
+import atexit
+import queue
+import threading
+import time
+
+
+class BatchWriter:
+    """Queue items and hand them to `flush(batch)` from a single writer thread.
+
+    A batch is flushed once `batch_size` items are waiting or `wait_seconds`
+    after its first item, whichever comes first. The queue is bounded: when
+    full, the oldest pending item is dropped (and returned by submit()).
+    The thread starts on first submit, so nothing runs before a fork, and
+    whatever is still queued is flushed at interpreter exit.
+    """
+    def __init__(self, name, flush, batch_size=50, wait_seconds=2.0, maxsize=1000):
+        self.name = name
+        self.flush = flush
+        self.batch_size = batch_size
+        self.wait_seconds = wait_seconds
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        atexit.register(self.close)
+
+    def submit(self, item):
+        """Queue an item; returns the item dropped to make room, if any."""
+        dropped = None
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    dropped = self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+        self._ensure_thread()
+        return dropped
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+
+    def _take_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.wait_seconds
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        try:
+            self.flush(batch)
+        except Exception as e:
+            print(f"{self.name}: error flushing {len(batch)} items: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._flush(self._take_batch(first))
+
+    def close(self):
+        """Stop the writer and flush whatever is still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.wait_seconds + 30)
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._flush(batch)
@@ -3,14 +3,59 @@ from google.oauth2.service_account import Credentials
 from datetime import datetime, timedelta
 import json
 import os
+import threading
 from dotenv import load_dotenv
+from services.cache import cached
+from services.batch_writer import BatchWriter
 
 load_dotenv()
 
+# Customer rows rarely change between calls; unknown numbers are re-checked sooner
+CUSTOMER_CACHE_TTL = int(os.getenv('CUSTOMER_CACHE_TTL_SECONDS', 86400))
+CUSTOMER_NEGATIVE_CACHE_TTL = int(os.getenv('CUSTOMER_NEGATIVE_CACHE_TTL_SECONDS', 300))
+
+def _normalize_phone(phone):
+    """Strip formatting so sheet and caller numbers compare equal"""
+    return str(phone).replace('+1', '').replace('-', '').replace('(', '').replace(')', '').replace(' ', '')
+
 class BookingService:
     # Class-level shared cache across all instances and services
     _bookings_cache = {}  # { 'YYYY-MM-DD': { 'ts': datetime, 'data': list } }
+    _weekly_count_cache = {}  # { week start datetime: { 'ts': datetime, 'count': int } }
+    # Call_Log rows are written behind the caller, one append per batch
+    _call_log_writer = None
+    # Authorized client + worksheet handles, shared by every instance in this process
+    _sheets = None
+    _sheets_pid = None
+    _sheets_lock = threading.Lock()
     def __init__(self):
+        with BookingService._sheets_lock:
+            # Re-authorize after a fork so workers never share the parent's sockets
+            if BookingService._sheets is None or BookingService._sheets_pid != os.getpid():
+                self._connect()
+                BookingService._sheets = (
+                    self.client, self.workbook,
+                    self.bookings_sheet, self.customers_sheet, self.calls_sheet
+                )
+                BookingService._sheets_pid = os.getpid()
+            else:
+                (self.client, self.workbook,
+                 self.bookings_sheet, self.customers_sheet, self.calls_sheet) = BookingService._sheets
+                self.sheet_id = os.getenv('BOOKING_SHEET_ID')
+
+        # Simple in-memory cache for date-based booking lookups (shared across instances)
+        # Alias the instance attribute to the class-level cache dict so all instances share it
+        self._bookings_cache = BookingService._bookings_cache
+
+        if BookingService._call_log_writer is None:
+            BookingService._call_log_writer = BatchWriter(
+                'call-log', self._append_call_logs,
+                batch_size=int(os.getenv('CALL_LOG_BATCH_SIZE', 50)),
+                wait_seconds=float(os.getenv('CALL_LOG_BATCH_WAIT_SECONDS', 1))
+            )
+
+    def _connect(self):
+        """Authorize, open the workbook and make sure its sheets and headers exist"""
         # Setup Google Sheets with updated credentials
         creds_dict = json.loads(os.getenv('GOOGLE_SHEETS_CREDS'))
         scope = [
@@ -32,10 +77,6 @@ class BookingService:
         self.customers_sheet = self._get_or_create_sheet('Customers')
         self.calls_sheet = self._get_or_create_sheet('Call_Log')
 
-        # Simple in-memory cache for date-based booking lookups (shared across instances)
-        # Alias the instance attribute to the class-level cache dict so all instances share it
-        self._bookings_cache = BookingService._bookings_cache
-
         # Initialize headers if needed
         self._initialize_headers()
     
@@ -82,22 +123,32 @@ class BookingService:
     def get_customer_by_phone(self, phone):
         """Get customer by phone number"""
         try:
-            # Normalize phone number
-            normalized_phone = phone.replace('+1', '').replace('-', '').replace('(', '').replace(')', '').replace(' ', '')
-            
-            customers = self.customers_sheet.get_all_records()
-            for customer in customers:
-                customer_phone = str(customer.get('Phone', '')).replace('+1', '').replace('-', '').replace('(', '').replace(')', '').replace(' ', '')
-                if customer_phone == normalized_phone:
-                    return customer
-            return None
+            return self._find_customer_by_phone(phone)
         except Exception as e:
             print(f"Error getting customer: {e}")
             return None
     
+    @cached(
+        ttl=CUSTOMER_CACHE_TTL,
+        negative_ttl=CUSTOMER_NEGATIVE_CACHE_TTL,
+        key=lambda self, phone: f"cust:{_normalize_phone(phone)}"
+    )
+    def _find_customer_by_phone(self, phone):
+        """Scan the Customers sheet (raises on sheet errors so they aren't cached)"""
+        # Same normalization as the cache key
+        normalized_phone = _normalize_phone(phone)
+        
+        customers = self.customers_sheet.get_all_records()
+        for customer in customers:
+            if _normalize_phone(customer.get('Phone', '')) == normalized_phone:
+                return customer
+        return None
+    
     def save_customer(self, data):
         """Save or update customer information"""
         try:
+            # Read the live row (a cached one may have a stale booking count)
+            self._find_customer_by_phone.invalidate(self, data['phone'])
             existing = self.get_customer_by_phone(data['phone'])
             
             if existing:
@@ -105,6 +156,7 @@ class BookingService:
                 row_index = self.customers_sheet.find(existing['Customer ID']).row
                 self.customers_sheet.update_cell(row_index, 6, int(existing.get('Total Bookings', 0)) + 1)
                 self.customers_sheet.update_cell(row_index, 7, datetime.now().strftime('%Y-%m-%d'))
+                self._find_customer_by_phone.invalidate(self, data['phone'])
                 return existing['Customer ID']
             else:
                 # Create new customer
@@ -120,6 +172,7 @@ class BookingService:
                     ''
                 ]
                 self.customers_sheet.append_row(row)
+                self._find_customer_by_phone.invalidate(self, data['phone'])
                 return customer_id
         except Exception as e:
             print(f"Error saving customer: {e}")
@@ -169,6 +222,19 @@ class BookingService:
             print(f"Error saving booking: {e}")
             return None
 
+    def mark_confirmation_sent(self, booking_id):
+        """Set Confirmation Sent = Yes on a booking row once the manager email has gone out"""
+        try:
+            cell = self.bookings_sheet.find(booking_id, in_column=1)
+            if cell is None:
+                return False
+            # Columns per _initialize_headers: Confirmation Sent col=27
+            self.bookings_sheet.update_cell(cell.row, 27, 'Yes')
+            return True
+        except Exception as e:
+            print(f"Error marking confirmation sent for {booking_id}: {e}")
+            return False
+    
     def update_latest_booking_addresses_for_phone(self, phone, pickup_address, dropoff_address):
         """Find the most recent booking row for a given phone and update addresses.
         Returns the updated booking record dict or None if not found/failed.
@@ -203,7 +269,7 @@ class BookingService:
             return None
     
     def log_call(self, call_sid, status, phone=None, direction='inbound', converted=False):
-        """Log call details"""
+        """Log call details (queued; rows are appended in batches)"""
         try:
             call_id = f"CALL-{datetime.now().strftime('%Y%m%d%H%M%S')}"
             row = [
@@ -218,10 +284,19 @@ class BookingService:
                 'Yes' if converted else 'No',
                 ''
             ]
-            self.calls_sheet.append_row(row)
+            dropped = BookingService._call_log_writer.submit(row)
+            if dropped is not None:
+                print(f"Call log queue full; dropped row for {dropped[1]}")
         except Exception as e:
             print(f"Error logging call: {e}")
     
+    def _append_call_logs(self, rows):
+        """Write queued Call_Log rows in one request (runs on the call-log writer)"""
+        try:
+            self.calls_sheet.append_rows(rows)
+        except Exception as e:
+            print(f"Error logging calls: {e}")
+    
     def log_sms(self, phone, message, direction):
         """Log SMS messages"""
         try:
@@ -252,9 +327,45 @@ class BookingService:
             print(f"Error getting bookings: {e}")
             return []
     
+    def get_bookings_for_date_range(self, start_date, end_date):
+        """Get bookings for each date from start_date to end_date (inclusive) with one sheet read.
+
+        Every date in the range is cached, so later get_bookings_for_date calls hit;
+        when all of them are already fresh in the cache the sheet isn't read.
+        """
+        try:
+            from datetime import datetime as _dt
+            by_date = {}
+            day = start_date
+            while day <= end_date:
+                by_date[day.strftime('%Y-%m-%d')] = []
+                day += timedelta(days=1)
+
+            now = _dt.now()
+            entries = [BookingService._bookings_cache.get(date_str) for date_str in by_date]
+            if all(e and (now - e['ts']).total_seconds() < 60 for e in entries):
+                return {date_str: e['data'] for date_str, e in zip(by_date, entries)}
+
+            for b in self.bookings_sheet.get_all_records():
+                bucket = by_date.get(str(b.get('Move Date', ''))[:10])
+                if bucket is not None:
+                    bucket.append(b)
+
+            now = _dt.now()
+            for date_str, result in by_date.items():
+                BookingService._bookings_cache[date_str] = {'ts': now, 'data': result}
+            return by_date
+        except Exception as e:
+            print(f"Error getting bookings: {e}")
+            return {}
+    
     def count_weekly_bookings(self, week_start_date):
-        """Count bookings for a specific week"""
+        """Count bookings for a specific week (cached ~60 seconds per week)"""
         try:
+            cache_entry = BookingService._weekly_count_cache.get(week_start_date)
+            if cache_entry and (datetime.now() - cache_entry['ts']).total_seconds() < 60:
+                return cache_entry['count']
+
             bookings = self.bookings_sheet.get_all_records()
             count = 0
             for booking in bookings:
@@ -266,61 +377,83 @@ class BookingService:
                             count += 1
                     except:
                         pass
+            BookingService._weekly_count_cache[week_start_date] = {'ts': datetime.now(), 'count': count}
             return count
         except Exception as e:
             print(f"Error counting weekly bookings: {e}")
             return 0
     
-    def save_partial_lead(self, call_sid, data):
-        """Save partial lead data when call disconnects"""
+    def _partial_lead_row(self, call_sid, data, saved_at=None):
+        """Build the Bookings row for a partial lead (saved_at: when the snapshot was taken)"""
+        saved_at = saved_at or datetime.now()
+        # Create a partial booking entry marked as incomplete; the call suffix keeps
+        # leads from different calls saved in the same second apart
+        booking_id = f"LEAD-{saved_at.strftime('%Y%m%d%H%M%S')}-{(call_sid or '')[-6:]}"
+        
+        # Safely get values with defaults
+        def safe_get(key, default=''):
+            """Safely get value and convert to string"""
+            value = data.get(key, default)
+            if value is None:
+                return ''
+            # Convert to string and clean
+            return str(value).strip()
+        
+        return [
+            booking_id,
+            saved_at.strftime('%Y-%m-%d %H:%M:%S'),
+            safe_get('name'),
+            safe_get('phone'),
+            safe_get('email'),
+            safe_get('move_type'),
+            safe_get('pickup_address'),
+            safe_get('pickup_type'),
+            safe_get('pickup_rooms'),
+            safe_get('pickup_stairs'),
+            safe_get('dropoff_address'),
+            safe_get('dropoff_type'),
+            safe_get('dropoff_rooms'),
+            safe_get('dropoff_stairs'),
+            safe_get('move_date'),
+            safe_get('move_time'),
+            '',  # packing
+            '',  # special items
+            '',  # special instructions
+            safe_get('total_distance'),  # distance
+            '',  # mileage cost
+            '',  # base rate
+            '',  # total estimate
+            'Incomplete - Call Disconnected',
+            call_sid,
+            'No',
+            'No'
+        ]
+    
+    def save_partial_leads(self, leads):
+        """Save several partial leads [(call_sid, data[, saved_at]), ...] in one append"""
         try:
-            # Create a partial booking entry marked as incomplete
-            booking_id = f"LEAD-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            
-            # Safely get values with defaults
-            def safe_get(key, default=''):
-                """Safely get value and convert to string"""
-                value = data.get(key, default)
-                if value is None:
-                    return ''
-                # Convert to string and clean
-                return str(value).strip()
-            
-            row = [
-                booking_id,
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                safe_get('name'),
-                safe_get('phone'),
-                safe_get('email'),
-                safe_get('move_type'),
-                safe_get('pickup_address'),
-                safe_get('pickup_type'),
-                safe_get('pickup_rooms'),
-                safe_get('pickup_stairs'),
-                safe_get('dropoff_address'),
-                safe_get('dropoff_type'),
-                safe_get('dropoff_rooms'),
-                safe_get('dropoff_stairs'),
-                safe_get('move_date'),
-                safe_get('move_time'),
-                '',  # packing
-                '',  # special items
-                '',  # special instructions
-                safe_get('total_distance'),  # distance
-                '',  # mileage cost
-                '',  # base rate
-                '',  # total estimate
-                'Incomplete - Call Disconnected',
-                call_sid,
-                'No',
-                'No'
-            ]
-            
-            self.bookings_sheet.append_row(row)
-            print(f"Saved partial lead: {booking_id}")
-            return booking_id
+            rows = []
+            booking_ids = set()
+            for lead in leads:
+                row = self._partial_lead_row(*lead)
+                if row[0] in booking_ids:
+                    # Same call snapshotted twice within a second
+                    row[0] = f"{row[0]}-{len(rows)}"
+                booking_ids.add(row[0])
+                rows.append(row)
+            if not rows:
+                return []
+            self.bookings_sheet.append_rows(rows)
+            booking_ids = [row[0] for row in rows]
+            print(f"Saved partial leads: {', '.join(booking_ids)}")
+            return booking_ids
         except Exception as e:
-            print(f"Error saving partial lead: {e}")
+            print(f"Error saving partial leads: {e}")
             import traceback
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
+    
+    def save_partial_lead(self, call_sid, data):
+        """Save partial lead data when call disconnects"""
+        booking_ids = self.save_partial_leads([(call_sid, data)])
+        return booking_ids[0] if booking_ids else None
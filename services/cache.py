@@ -0,0 +1,126 @@
+# Shared Redis client and a lookaside cache decorator for slow lookups
+import functools
+import os
+import time
+import orjson
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_client = None
+# In-process fallback when REDIS_URL is unset: { key: (expires_at, value) }
+_local_cache = {}
+_LOCAL_CACHE_MAX = 1024
+
+
+def get_redis():
+    """Return the process-wide Redis client, or None when REDIS_URL is unset."""
+    global _client
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return None
+    if _client is None:
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 64))
+        )
+        _client = redis.Redis(connection_pool=pool)
+    return _client
+
+
+def _local_get(cache_key):
+    entry = _local_cache.get(cache_key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry
+
+
+def _local_set(cache_key, value, ttl):
+    if len(_local_cache) >= _LOCAL_CACHE_MAX:
+        now = time.monotonic()
+        for k in [k for k, (expires, _) in _local_cache.items() if expires < now]:
+            _local_cache.pop(k, None)
+        if len(_local_cache) >= _LOCAL_CACHE_MAX:
+            _local_cache.clear()
+    _local_cache[cache_key] = (time.monotonic() + ttl, value)
+
+
+def claim(cache_key, ttl):
+    """True for the first caller to claim `cache_key` within `ttl` seconds (SET NX).
+
+    Fails open: if Redis is unreachable the caller proceeds.
+    """
+    client = get_redis()
+    if client is None:
+        if _local_get(cache_key) is not None:
+            return False
+        _local_set(cache_key, True, ttl)
+        return True
+    try:
+        return bool(client.set(cache_key, b'1', nx=True, ex=ttl))
+    except redis.RedisError as e:
+        print(f"Cache claim failed for {cache_key}: {e}")
+        return True
+
+
+def release(cache_key):
+    """Drop a claim so the next caller can take it (e.g. the claimed work failed)"""
+    _local_cache.pop(cache_key, None)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(cache_key)
+        except redis.RedisError as e:
+            print(f"Cache release failed for {cache_key}: {e}")
+
+
+def cached(ttl, key, negative_ttl=None):
+    """Cache a function's JSON-serializable result in Redis for `ttl` seconds.
+
+    `key` builds the cache key from the call arguments. A None result is
+    cached for `negative_ttl` seconds (not at all when negative_ttl is None).
+    Exceptions are never cached. The wrapper exposes `invalidate(*args)`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            client = get_redis()
+            if client is None:
+                entry = _local_get(cache_key)
+                if entry is not None:
+                    return entry[1]
+            else:
+                try:
+                    raw = client.get(cache_key)
+                    if raw is not None:
+                        return orjson.loads(raw)
+                except redis.RedisError as e:
+                    print(f"Cache read failed for {cache_key}: {e}")
+
+            value = func(*args, **kwargs)
+            expires = ttl if value is not None else negative_ttl
+            if expires:
+                if client is None:
+                    _local_set(cache_key, value, expires)
+                else:
+                    try:
+                        client.setex(cache_key, expires, orjson.dumps(value))
+                    except redis.RedisError as e:
+                        print(f"Cache write failed for {cache_key}: {e}")
+            return value
+
+        def invalidate(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            _local_cache.pop(cache_key, None)
+            client = get_redis()
+            if client is not None:
+                try:
+                    client.delete(cache_key)
+                except redis.RedisError as e:
+                    print(f"Cache invalidation failed for {cache_key}: {e}")
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
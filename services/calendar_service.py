@@ -117,6 +117,14 @@ class CalendarService:
     
     def _is_slot_available(self, date, start_hour, duration_hours, existing_bookings):
         """Check if specific time slot is available"""
+        return self._is_free(start_hour, duration_hours, self._booking_hours(existing_bookings))
+    
+    def _booking_hours(self, bookings):
+        """Start hour of each booking, parsed once per day rather than per candidate slot"""
+        return [self._parse_time_to_hour(b.get('Move Time', '10:00')) for b in bookings]
+    
+    def _is_free(self, start_hour, duration_hours, booking_hours):
+        """Check a slot against working hours and pre-parsed booking start hours"""
         end_hour = start_hour + duration_hours
         
         # Check if within working hours
@@ -124,10 +132,7 @@ class CalendarService:
             return False
         
         # Check for conflicts with existing bookings
-        for booking in existing_bookings:
-            booking_time = booking.get('Move Time', '10:00')
-            booking_hour = self._parse_time_to_hour(booking_time)
-            
+        for booking_hour in booking_hours:
             # Assume average 3-hour jobs if not specified
             booking_duration = 3
             booking_end_hour = booking_hour + booking_duration
@@ -147,22 +152,19 @@ class CalendarService:
         except Exception:
             duration_hours = 3
         
+        booking_hours = self._booking_hours(existing_bookings)
         # Determine if there is already a morning booking on this date
-        has_morning_booking = False
-        for b in existing_bookings:
-            bh = self._parse_time_to_hour(b.get('Move Time', '10:00'))
-            if bh < 12:
-                has_morning_booking = True
-                break
+        has_morning_booking = any(bh < 12 for bh in booking_hours)
         
         # Check same day first
         # If morning booking exists, start alternatives at 1 PM to present 1-3 PM window first
         start_hour = 13 if has_morning_booking else self.working_hours['start']
         for hour in range(start_hour, self.working_hours['end'] - duration_hours):
-            if self._is_slot_available(requested_date, hour, duration_hours, existing_bookings):
+            if self._is_free(hour, duration_hours, booking_hours):
                 time_label = self._hour_to_label(hour)
                 alternatives.append({
                     'date': requested_date.strftime('%Y-%m-%d'),
+                    'date_formatted': requested_date.strftime('%B %d, %Y'),
                     'time': time_label,
                     'hour': hour,
                     'window': self._window_label(hour)
@@ -170,16 +172,20 @@ class CalendarService:
                 if len(alternatives) >= num_alternatives:
                     return alternatives
         
-        # Check next 7 days
+        # Check next 7 days (one sheet read for the whole week unless it's already cached)
+        week = self.booking_service.get_bookings_for_date_range(
+            requested_date + timedelta(days=1), requested_date + timedelta(days=7)
+        )
         for day_offset in range(1, 8):
             check_date = requested_date + timedelta(days=day_offset)
-            day_bookings = self.booking_service.get_bookings_for_date(check_date)
+            day_hours = self._booking_hours(week.get(check_date.strftime('%Y-%m-%d'), []))
             
             for hour in range(self.working_hours['start'], self.working_hours['end'] - duration_hours):
-                if self._is_slot_available(check_date, hour, duration_hours, day_bookings):
+                if self._is_free(hour, duration_hours, day_hours):
                     time_label = self._hour_to_label(hour)
                     alternatives.append({
                         'date': check_date.strftime('%Y-%m-%d'),
+                        'date_formatted': check_date.strftime('%B %d, %Y'),
                         'time': time_label,
                         'hour': hour,
                         'day_name': check_date.strftime('%A'),
@@ -1,86 +1,56 @@
 # Google Maps distance calculation
 import googlemaps
 import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from datetime import datetime
+from services.cache import cached
 
 load_dotenv()
 
+# Drive times between two ZIPs barely change; repeat pairs skip the Maps call
+P2D_CACHE_TTL = int(os.getenv('P2D_CACHE_TTL_SECONDS', 86400))
+
+def _route_key(address):
+    return ' '.join(str(address).lower().split())
+
+_maps_client = None
+_maps_pid = None
+_maps_lock = threading.Lock()
+
+def get_maps_client(api_key):
+    """Process-wide Maps client over one keep-alive HTTPS pool (rebuilt after a fork)"""
+    global _maps_client, _maps_pid
+    with _maps_lock:
+        if _maps_client is None or _maps_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=int(os.getenv('MAPS_HTTP_POOL_SIZE', 32))
+            )
+            session.mount('https://', adapter)
+            _maps_client = googlemaps.Client(key=api_key, requests_session=session)
+            _maps_pid = os.getpid()
+        return _maps_client
+
 class DistanceService:
     def __init__(self):
         self.api_key = os.getenv('GOOGLE_MAPS_API_KEY')
-        self.gmaps = googlemaps.Client(key=self.api_key)
         self.office_address = os.getenv('OFFICE_ADDRESS', '2800 Rolido Dr Apt 238, Houston, TX 77063')
     
+    @property
+    def gmaps(self):
+        return get_maps_client(self.api_key)
+    
     def calculate_route_distance(self, pickup_address, dropoff_address):
         """
         Calculate total distance: Office -> Pickup -> Dropoff -> Office
         Returns distance in miles and estimated duration
         """
         try:
-            def _extract_ok_element(matrix, leg_name):
-                try:
-                    elem = matrix['rows'][0]['elements'][0]
-                except Exception:
-                    raise ValueError(f"Invalid response structure for {leg_name}")
-                status = elem.get('status', 'UNKNOWN')
-                if status != 'OK':
-                    raise ValueError(f"{leg_name} element status {status}")
-                if 'distance' not in elem or 'duration' not in elem:
-                    raise ValueError(f"{leg_name} missing distance/duration")
-                return elem
-
-            # Leg 1: Office to Pickup
-            leg1 = self.gmaps.distance_matrix(
-                origins=[self.office_address],
-                destinations=[pickup_address],
-                mode='driving',
-                units='imperial'
-            )
-            elem1 = _extract_ok_element(leg1, 'office->pickup')
-
-            # Leg 2: Pickup to Dropoff
-            leg2 = self.gmaps.distance_matrix(
-                origins=[pickup_address],
-                destinations=[dropoff_address],
-                mode='driving',
-                units='imperial'
-            )
-            elem2 = _extract_ok_element(leg2, 'pickup->dropoff')
-
-            # Leg 3: Dropoff back to Office
-            leg3 = self.gmaps.distance_matrix(
-                origins=[dropoff_address],
-                destinations=[self.office_address],
-                mode='driving',
-                units='imperial'
-            )
-            elem3 = _extract_ok_element(leg3, 'dropoff->office')
-
-            # Extract distances
-            distance1 = elem1['distance']['value'] / 1609.34  # Convert meters to miles
-            distance2 = elem2['distance']['value'] / 1609.34
-            distance3 = elem3['distance']['value'] / 1609.34
-            
-            # Extract durations (in minutes)
-            duration1 = elem1['duration']['value'] / 60
-            duration2 = elem2['duration']['value'] / 60
-            duration3 = elem3['duration']['value'] / 60
-            
-            total_distance = distance1 + distance2 + distance3
-            total_duration = duration1 + duration2 + duration3
-            
-            return {
-                'total_distance': round(total_distance, 2),
-                'p2p_distance': round(distance2, 2),
-                'total_duration_minutes': round(total_duration, 2),
-                'leg1_miles': round(distance1, 2),
-                'leg2_miles': round(distance2, 2),
-                'leg3_miles': round(distance3, 2),
-                'p2d_duration_minutes': round(duration2, 2),  # pickup to dropoff travel time
-                'success': True
-            }
-        
+            return self._fetch_route(pickup_address, dropoff_address)
         except Exception as e:
             print(f"Error calculating distance: {e}")
             return {
@@ -90,6 +60,77 @@ class DistanceService:
                 'success': False,
                 'error': str(e)
             }
+
+    @cached(
+        ttl=P2D_CACHE_TTL,
+        key=lambda self, pickup, dropoff: (
+            f"route:{_route_key(self.office_address)}|{_route_key(pickup)}|{_route_key(dropoff)}"
+        )
+    )
+    def _fetch_route(self, pickup_address, dropoff_address):
+        """Ask Maps for the three legs (raises on API errors so they aren't cached)"""
+        def _extract_ok_element(matrix, leg_name):
+            try:
+                elem = matrix['rows'][0]['elements'][0]
+            except Exception:
+                raise ValueError(f"Invalid response structure for {leg_name}")
+            status = elem.get('status', 'UNKNOWN')
+            if status != 'OK':
+                raise ValueError(f"{leg_name} element status {status}")
+            if 'distance' not in elem or 'duration' not in elem:
+                raise ValueError(f"{leg_name} missing distance/duration")
+            return elem
+
+        # Leg 1: Office to Pickup
+        leg1 = self.gmaps.distance_matrix(
+            origins=[self.office_address],
+            destinations=[pickup_address],
+            mode='driving',
+            units='imperial'
+        )
+        elem1 = _extract_ok_element(leg1, 'office->pickup')
+
+        # Leg 2: Pickup to Dropoff
+        leg2 = self.gmaps.distance_matrix(
+            origins=[pickup_address],
+            destinations=[dropoff_address],
+            mode='driving',
+            units='imperial'
+        )
+        elem2 = _extract_ok_element(leg2, 'pickup->dropoff')
+
+        # Leg 3: Dropoff back to Office
+        leg3 = self.gmaps.distance_matrix(
+            origins=[dropoff_address],
+            destinations=[self.office_address],
+            mode='driving',
+            units='imperial'
+        )
+        elem3 = _extract_ok_element(leg3, 'dropoff->office')
+
+        # Extract distances
+        distance1 = elem1['distance']['value'] / 1609.34  # Convert meters to miles
+        distance2 = elem2['distance']['value'] / 1609.34
+        distance3 = elem3['distance']['value'] / 1609.34
+        
+        # Extract durations (in minutes)
+        duration1 = elem1['duration']['value'] / 60
+        duration2 = elem2['duration']['value'] / 60
+        duration3 = elem3['duration']['value'] / 60
+        
+        total_distance = distance1 + distance2 + distance3
+        total_duration = duration1 + duration2 + duration3
+        
+        return {
+            'total_distance': round(total_distance, 2),
+            'p2p_distance': round(distance2, 2),
+            'total_duration_minutes': round(total_duration, 2),
+            'leg1_miles': round(distance1, 2),
+            'leg2_miles': round(distance2, 2),
+            'leg3_miles': round(distance3, 2),
+            'p2d_duration_minutes': round(duration2, 2),  # pickup to dropoff travel time
+            'success': True
+        }
     
     def validate_address(self, address):
         """Validate if address exists using Google Geocoding"""
@@ -146,18 +187,26 @@ class DistanceService:
     def get_pickup_to_dropoff_duration(self, pickup_address, dropoff_address):
         """Lightweight check: only compute pickup->dropoff travel time (minutes)."""
         try:
-            leg = self.gmaps.distance_matrix(
-                origins=[pickup_address],
-                destinations=[dropoff_address],
-                mode='driving',
-                units='imperial'
-            )
-            elem = leg['rows'][0]['elements'][0]
-            status = elem.get('status', 'UNKNOWN')
-            if status != 'OK' or 'duration' not in elem:
-                raise ValueError(f"pickup->dropoff element status {status}")
-            duration_min = elem['duration']['value'] / 60
-            return round(duration_min, 2)
+            return self._fetch_pickup_to_dropoff_duration(pickup_address, dropoff_address)
         except Exception as e:
             print(f"Error getting pickup->dropoff duration: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    @cached(
+        ttl=P2D_CACHE_TTL,
+        key=lambda self, pickup, dropoff: f"p2d:{_route_key(pickup)}|{_route_key(dropoff)}"
+    )
+    def _fetch_pickup_to_dropoff_duration(self, pickup_address, dropoff_address):
+        """Ask Maps for the drive time (raises on API errors so they aren't cached)"""
+        leg = self.gmaps.distance_matrix(
+            origins=[pickup_address],
+            destinations=[dropoff_address],
+            mode='driving',
+            units='imperial'
+        )
+        elem = leg['rows'][0]['elements'][0]
+        status = elem.get('status', 'UNKNOWN')
+        if status != 'OK' or 'duration' not in elem:
+            raise ValueError(f"pickup->dropoff element status {status}")
+        duration_min = elem['duration']['value'] / 60
+        return round(duration_min, 2)
@@ -1,5 +1,6 @@
 # Dynamic pricing logic
 from datetime import datetime, timedelta
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -154,34 +155,50 @@ class PricingService:
         if estimate.get('requires_manual_quote'):
             return estimate['message']
         
-        message = f"Based on the information provided, here's your estimate: "
-        message += f"We'll need {estimate['movers_needed']} movers and a truck. "
-        message += f"The hourly rate is ${estimate['base_rate']} per hour. "
-        message += f"We estimate approximately {estimate['estimated_hours']} hours for your move. "
-        # Mention travel time charge if present
+        return _estimate_message(
+            estimate['movers_needed'],
+            estimate['base_rate'],
+            estimate['estimated_hours'],
+            estimate.get('travel_time_hours'),
+            estimate['mileage_cost'],
+            # Distance is only spoken with a mileage charge
+            estimate['total_distance'] if estimate['mileage_cost'] > 0 else None,
+            estimate['packing_cost'],
+            estimate['total_estimate'],
+        )
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _estimate_message(movers_needed, base_rate, estimated_hours, travel_time_hours, mileage_cost, total_distance, packing_cost, total_estimate):
+    """Spoken estimate sentence (memoized: re-entering the estimate yields the same figures)"""
+    message = f"Based on the information provided, here's your estimate: "
+    message += f"We'll need {movers_needed} movers and a truck. "
+    message += f"The hourly rate is ${base_rate} per hour. "
+    message += f"We estimate approximately {estimated_hours} hours for your move. "
+    # Mention travel time charge if present
+    try:
+        ttime = float(travel_time_hours or 0)
+    except Exception:
+        ttime = 0
+    if ttime > 0:
+        # Compute travel cost for messaging clarity
         try:
-            ttime = float(estimate.get('travel_time_hours') or 0)
+            base_rate = float(base_rate or 0)
+            travel_cost = round(base_rate * ttime, 2)
+            # Normalize 0.5 hours into minutes if clean
+            minutes = int(round(ttime * 60))
+            message += f"An additional {minutes} minutes for travel time is included (about ${travel_cost}). "
         except Exception:
-            ttime = 0
-        if ttime > 0:
-            # Compute travel cost for messaging clarity
-            try:
-                base_rate = float(estimate.get('base_rate') or 0)
-                travel_cost = round(base_rate * ttime, 2)
-                # Normalize 0.5 hours into minutes if clean
-                minutes = int(round(ttime * 60))
-                message += f"An additional {minutes} minutes for travel time is included (about ${travel_cost}). "
-            except Exception:
-                message += "An additional travel time of about 30 minutes is included. "
-        
-        if estimate['mileage_cost'] > 0:
-            message += f"The total distance is {estimate['total_distance']} miles, "
-            message += f"with a mileage charge of ${estimate['mileage_cost']}. "
-        
-        if estimate['packing_cost'] > 0:
-            message += f"Packing service adds ${estimate['packing_cost']}. "
-        
-        message += f"Your total estimated cost is ${estimate['total_estimate']}. "
-        message += "Please note this is an estimate, and the final cost will depend on the actual time required."
-        
-        return message
\ No newline at end of file
+            message += "An additional travel time of about 30 minutes is included. "
+    
+    if mileage_cost > 0:
+        message += f"The total distance is {total_distance} miles, "
+        message += f"with a mileage charge of ${mileage_cost}. "
+    
+    if packing_cost > 0:
+        message += f"Packing service adds ${packing_cost}. "
+    
+    message += f"Your total estimated cost is ${total_estimate}. "
+    message += "Please note this is an estimate, and the final cost will depend on the actual time required."
+    
+    return message
\ No newline at end of file
@@ -0,0 +1,242 @@
+# Call session storage (Redis-backed, shared across workers/hosts)
+import os
+import time
+import threading
+from contextlib import contextmanager
+import orjson
+from dotenv import load_dotenv
+from services.cache import get_redis
+
+load_dotenv()
+
+# In-process fallback cap; expired sessions are swept when it's reached
+_LOCAL_SESSIONS_MAX = 10000
+
+
+class SessionStore:
+    """Dict-like store of per-call sessions keyed by CallSid.
+
+    With REDIS_URL set, sessions live in Redis (SETEX with a TTL) so any
+    gunicorn worker or host can serve any Twilio webhook for a call.
+    Without it, sessions fall back to an in-process dict (single worker only).
+    """
+    # Class-level shared state across all instances
+    # { call_sid: [expires_at, session] }; expiry slides on every access, like the Redis TTL
+    _local_sessions = {}
+    # In-process fallback for turn locks and replies (see begin_turn)
+    _local_turns = {}
+    _local_replies = {}
+    _turn_guard = threading.Lock()
+    # Sessions loaded from Redis during the current request, per thread.
+    # Handlers mutate the dicts in place; flush() writes them back once.
+    _request_state = threading.local()
+
+    def __init__(self):
+        self.ttl = int(os.getenv('SESSION_TTL_SECONDS', 1800))
+        self.key_prefix = os.getenv('SESSION_KEY_PREFIX', 'call:')
+        self.turn_lock_ttl = int(os.getenv('TURN_LOCK_TTL_SECONDS', 30))
+        self.reply_ttl = int(os.getenv('TURN_REPLY_TTL_SECONDS', 60))
+        # Shared client (one connection pool per process); None -> in-process dict
+        self.client = get_redis()
+
+    def _key(self, call_sid):
+        return f"{self.key_prefix}{call_sid}"
+
+    def _loaded(self):
+        # { call_sid: [session, serialized bytes as last read/written] }
+        loaded = getattr(SessionStore._request_state, 'sessions', None)
+        if loaded is None:
+            loaded = SessionStore._request_state.sessions = {}
+        return loaded
+
+    def get(self, call_sid, default=None):
+        """Return the session for a call, or `default` if there is none."""
+        if not call_sid:
+            return default
+        if self.client is None:
+            entry = SessionStore._local_sessions.get(call_sid)
+            if entry is None:
+                return default
+            now = time.monotonic()
+            if entry[0] < now:
+                SessionStore._local_sessions.pop(call_sid, None)
+                return default
+            entry[0] = now + self.ttl
+            return entry[1]
+
+        loaded = self._loaded()
+        if call_sid in loaded:
+            return loaded[call_sid][0]
+        raw = self.client.get(self._key(call_sid))
+        if raw is None:
+            return default
+        session = orjson.loads(raw)
+        loaded[call_sid] = [session, raw]
+        return session
+
+    def set(self, call_sid, session, ex=None):
+        """Store a session, (re)starting its TTL."""
+        if self.client is None:
+            self._local_set(call_sid, session, ex or self.ttl)
+            return
+        raw = orjson.dumps(session)
+        self._loaded()[call_sid] = [session, raw]
+        self.client.setex(self._key(call_sid), ex or self.ttl, raw)
+
+    def _local_set(self, call_sid, session, ttl):
+        sessions = SessionStore._local_sessions
+        if call_sid not in sessions and len(sessions) >= _LOCAL_SESSIONS_MAX:
+            self._sweep_local()
+            if len(sessions) >= _LOCAL_SESSIONS_MAX:
+                sessions.pop(next(iter(sessions)), None)  # oldest call first
+        sessions[call_sid] = [time.monotonic() + ttl, session]
+
+    def _sweep_local(self):
+        """Drop expired in-process sessions and turn replies (calls that never sent a final status)"""
+        now = time.monotonic()
+        for call_sid, (expires, _) in list(SessionStore._local_sessions.items()):
+            if expires < now:
+                SessionStore._local_sessions.pop(call_sid, None)
+        for call_sid, entry in list(SessionStore._local_replies.items()):
+            if entry[0] < now:
+                SessionStore._local_replies.pop(call_sid, None)
+
+    def setdefault(self, call_sid, default):
+        """Return the existing session, or store and return `default`."""
+        session = self.get(call_sid)
+        if session is None:
+            session = default
+            self.set(call_sid, session)
+        return session
+
+    def delete(self, call_sid):
+        """Forget a call's session (and any cached turn reply)."""
+        if self.client is None:
+            SessionStore._local_sessions.pop(call_sid, None)
+            SessionStore._local_replies.pop(call_sid, None)
+            return
+        self._loaded().pop(call_sid, None)
+        self.client.delete(self._key(call_sid), f"reply:{call_sid}")
+
+    def _write_back(self, call_sids):
+        """SETEX the given loaded sessions that changed, in one pipeline."""
+        loaded = self._loaded()
+        pipe = None
+        try:
+            for call_sid in call_sids:
+                entry = loaded.get(call_sid)
+                if entry is None:
+                    continue
+                raw = orjson.dumps(entry[0])
+                if raw == entry[1]:
+                    continue  # read-only turn: nothing to write
+                if pipe is None:
+                    pipe = self.client.pipeline(transaction=False)
+                pipe.setex(self._key(call_sid), self.ttl, raw)
+            if pipe is not None:
+                pipe.execute()
+        finally:
+            for call_sid in call_sids:
+                loaded.pop(call_sid, None)
+
+    @contextmanager
+    def session_txn(self, call_sid, default=None):
+        """Scope one webhook turn: one GET on entry, at most one SETEX on exit.
+
+        Handlers called inside the block share the same session dict (the
+        per-thread identity map), so their mutations are written together.
+        """
+        session = self.get(call_sid, default)
+        try:
+            yield session
+        finally:
+            if self.client is not None:
+                self._write_back([call_sid])
+
+    def flush(self):
+        """Write back changed sessions loaded during this request (call at request end)."""
+        if self.client is None:
+            return
+        loaded = self._loaded()
+        if loaded:
+            self._write_back(list(loaded))
+
+    # --- Twilio retry coalescing -------------------------------------------
+    # Twilio retries a webhook that times out. Each turn's TwiML is kept under
+    # reply:{call_sid} with the request's turn_key, so a retry of that request
+    # replays it (whether the turn is still running or already finished)
+    # instead of re-running the handlers against the advanced session.
+
+    def begin_turn(self, call_sid, turn_key):
+        """Claim the call for one turn. False if a turn is already running."""
+        if self.client is None:
+            with SessionStore._turn_guard:
+                if call_sid in SessionStore._local_turns:
+                    return False
+                SessionStore._local_turns[call_sid] = turn_key
+                return True
+        return bool(self.client.set(f"turn:{call_sid}", turn_key, nx=True, ex=self.turn_lock_ttl))
+
+    def end_turn(self, call_sid, turn_key, body):
+        """Keep the turn's reply for retries of the same request, then release the call."""
+        try:
+            if body is not None:
+                if isinstance(body, bytes):
+                    body = body.decode('utf-8')
+                if self.client is None:
+                    SessionStore._local_replies[call_sid] = (time.monotonic() + self.reply_ttl, turn_key, body)
+                else:
+                    self.client.setex(f"reply:{call_sid}", self.reply_ttl, orjson.dumps([turn_key, body]))
+        finally:
+            if self.client is None:
+                with SessionStore._turn_guard:
+                    SessionStore._local_turns.pop(call_sid, None)
+            else:
+                self.client.delete(f"turn:{call_sid}")
+
+    def running_turn(self, call_sid):
+        """turn_key of the turn currently holding the call, else None"""
+        if self.client is None:
+            return SessionStore._local_turns.get(call_sid)
+        raw = self.client.get(f"turn:{call_sid}")
+        return raw.decode('utf-8') if raw is not None else None
+
+    def cached_reply(self, call_sid, turn_key):
+        """TwiML of the last finished turn if it answered this same request, else None"""
+        if self.client is None:
+            entry = SessionStore._local_replies.get(call_sid)
+            if entry and entry[0] >= time.monotonic() and entry[1] == turn_key:
+                return entry[2]
+            return None
+        raw = self.client.get(f"reply:{call_sid}")
+        if raw is None:
+            return None
+        reply_key, body = orjson.loads(raw)
+        return body if reply_key == turn_key else None
+
+    def wait_for_reply(self, call_sid, turn_key, timeout=15.0, interval=0.05):
+        """If the running turn is the same request, wait for and return its reply."""
+        if self.running_turn(call_sid) != turn_key:
+            return None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            reply = self.cached_reply(call_sid, turn_key)
+            if reply is not None:
+                return reply
+            if self.running_turn(call_sid) != turn_key:
+                # finished without publishing; the reply may have landed just now
+                return self.cached_reply(call_sid, turn_key)
+            time.sleep(interval)
+        return None
+
+    def __getitem__(self, call_sid):
+        session = self.get(call_sid)
+        if session is None:
+            raise KeyError(call_sid)
+        return session
+
+    def __setitem__(self, call_sid, session):
+        self.set(call_sid, session)
+
+    def __contains__(self, call_sid):
+        return self.get(call_sid) is not None
@@ -1,16 +1,21 @@
 # Twilio SMS notifications
-from twilio.rest import Client
+from services.twilio_client import get_twilio_client
+from services.cache import claim, release
+import hashlib
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Identical texts to the same number within this window are sent once
+SMS_DEDUP_SECONDS = int(os.getenv('SMS_DEDUP_SECONDS', 120))
+
 class SMSService:
     def __init__(self):
         self.account_sid = os.getenv('TWILIO_ACCOUNT_SID')
         self.auth_token = os.getenv('TWILIO_AUTH_TOKEN')
         self.from_number = os.getenv('TWILIO_PHONE_NUMBER')
-        self.client = Client(self.account_sid, self.auth_token)
+        self.client = get_twilio_client()
         self.enabled = os.getenv('ENABLE_SMS_NOTIFICATIONS', 'True') == 'True'
     
     def send_sms(self, to_number, message):
@@ -32,6 +37,18 @@ class SMSService:
             print(f"Error sending SMS: {e}")
             return None
     
+    def send_sms_once(self, to_number, message):
+        """Send SMS unless the same text went to this number in the last SMS_DEDUP_SECONDS"""
+        digest = hashlib.blake2b(f"{to_number}|{message}".encode('utf-8'), digest_size=16).hexdigest()
+        key = f"sms:{digest}"
+        if not claim(key, SMS_DEDUP_SECONDS):
+            print(f"Duplicate SMS to {to_number} skipped")
+            return None
+        sid = self.send_sms(to_number, message)
+        if sid is None:
+            release(key)  # not sent: let the next attempt go through
+        return sid
+    
     def send_booking_confirmation(self, booking_data):
         """Send booking confirmation SMS"""
         message = f"""
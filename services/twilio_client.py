@@ -0,0 +1,37 @@
+# Shared Twilio REST client over one pooled HTTPS session
+import os
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+load_dotenv()
+
+_client = None
+
+
+class PooledHttpClient(TwilioHttpClient):
+    """TwilioHttpClient with a sized keep-alive pool and connect-only retries"""
+    def __init__(self, pool_size=32, timeout=5.0):
+        super().__init__(timeout=timeout)
+        # read=0: never resend a request Twilio may already have acted on (SMS, calls)
+        retry = Retry(total=2, read=0, backoff_factor=0.1)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+
+
+def get_twilio_client():
+    """Return the process-wide Twilio client (SMS, outbound calls, warm-up)."""
+    global _client
+    if _client is None:
+        http_client = PooledHttpClient(
+            pool_size=int(os.getenv('TWILIO_HTTP_POOL_SIZE', 32)),
+            timeout=float(os.getenv('TWILIO_HTTP_TIMEOUT_SECONDS', 5))
+        )
+        _client = Client(
+            os.getenv('TWILIO_ACCOUNT_SID'),
+            os.getenv('TWILIO_AUTH_TOKEN'),
+            http_client=http_client
+        )
+    return _client
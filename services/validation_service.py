@@ -1,7 +1,30 @@
 # Input validation & parsing
+import functools
 import re
 from datetime import datetime, timedelta
 
+# Yes/no words matched as whole words ("yesterday" is not a yes)
+_YES_KEYWORDS = ['yes', 'yeah', 'yep', 'yup', 'ya', 'sure', 'okay', 'ok', 'alright', 'correct', 'right', 'affirmative']
+_NO_KEYWORDS = ['no', 'nope', 'nah', 'not', 'none', 'nothing', 'incorrect', 'wrong', 'negative']
+_YES_NO_REGEX = re.compile(
+    r"\b(?:(?P<yes>%s)|(?P<no>%s))\b" % ('|'.join(_YES_KEYWORDS), '|'.join(_NO_KEYWORDS))
+)
+# Bare one-word answers ("Yes.", "nope") resolve with one dict lookup
+_YES_NO_WORDS = {**dict.fromkeys(_YES_KEYWORDS, 'yes'), **dict.fromkeys(_NO_KEYWORDS, 'no')}
+
+
+@functools.lru_cache(maxsize=1024)
+def _yes_no_answer(text):
+    """Classify lowercased text (memoized: ASR returns the same short answers all day)"""
+    answer = _YES_NO_WORDS.get(text.strip().rstrip('.!?,'))
+    if answer:
+        return answer
+    match = _YES_NO_REGEX.search(text)
+    if not match:
+        return None
+    return 'yes' if match.group('yes') else 'no'
+
+
 class ValidationService:
     def __init__(self):
         self.digit_map = {
@@ -23,6 +46,22 @@ class ValidationService:
             '0': 'zero', '1': 'one', '2': 'two', '3': 'three', '4': 'four',
             '5': 'five', '6': 'six', '7': 'seven', '8': 'eight', '9': 'nine'
         }
+        # Digit/word conversions in one C-level pass each
+        self._digit_words_regex = re.compile(r'\b(?:%s)\b' % '|'.join(self.digit_map))
+        self._non_digit_regex = re.compile(r'[^0-9]')
+        self._spoken_table = str.maketrans({d: w + ' ' for d, w in self.digit_to_word.items()})
+        # Room counts: number words (found anywhere, overlaps included), else the first integer
+        self._room_words = {
+            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+        }
+        self._room_word_regex = re.compile('(?=(%s))' % '|'.join(self._room_words))
+        self._int_regex = re.compile(r'\d+')
+        # Stairs: an explicit "no stairs" wins, else any stairs/elevator word
+        no_stairs_keywords = ['no stairs', 'no step', 'ground floor', 'first floor', 'main floor', 'flat']
+        stairs_keywords = ['stair', 'step', 'floor', 'level', 'elevator', 'lift']
+        self._no_stairs_regex = re.compile('|'.join(map(re.escape, no_stairs_keywords)))
+        self._stairs_regex = re.compile('|'.join(map(re.escape, stairs_keywords)))
         # Common noise tokens to strip when recognizing phone numbers
         self.noise_tokens = [
             'my number is', 'it is', 'its', 'is', 'the number is', 'number is', 'call me at',
@@ -41,11 +80,8 @@ class ValidationService:
         """
         if not digits:
             return ''
-        # Remove any non-digit characters
-        clean_digits = re.sub(r'[^0-9]', '', digits)
-        # Convert each digit to its word
-        words = [self.digit_to_word.get(d, d) for d in clean_digits]
-        return ' '.join(words)
+        # Drop non-digits, then map each digit to "word "
+        return self._non_digit_regex.sub('', digits).translate(self._spoken_table).rstrip()
     
     def extract_digits(self, speech_text: str) -> str:
         """Extract just the numeric digits from a spoken phone input.
@@ -70,14 +106,11 @@ class ValidationService:
         text = text.replace('remaining digits', '')
         text = text.replace('the rest is', '')
         
-        # Map spoken numbers to digits (coarse)
-        for word, digit in self.digit_map.items():
-            # Use word boundaries to avoid partial matches
-            text = re.sub(r'\b' + word + r'\b', digit, text)
+        # Map spoken numbers to digits (coarse); whole words only
+        text = self._digit_words_regex.sub(lambda m: self.digit_map[m.group()], text)
         
         # Keep digits only
-        digits = re.sub(r'[^0-9]', '', text)
-        return digits
+        return self._non_digit_regex.sub('', text)
 
     def format_phone(self, digits: str) -> str:
         """Format digits into a readable phone string.
@@ -327,21 +360,16 @@ class ValidationService:
         """Extract room count from speech"""
         text = speech_text.lower().strip()
         
-        # Map spoken numbers to digits
-        number_words = {
-            'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-            'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-        }
-        
-        for word, num in number_words.items():
-            if word in text:
-                return num
+        # The smallest number word present wins, as when checking one..ten in order
+        found = [self._room_words[m.group(1)] for m in self._room_word_regex.finditer(text)]
+        if found:
+            return min(found)
         
         # Extract digits
-        digits = re.findall(r'\d+', text)
+        digits = self._int_regex.search(text)
         if digits:
             try:
-                n = int(digits[0])
+                n = int(digits.group())
             except Exception:
                 return None
             # Clamp to a sensible range 1-10 to avoid ASR artifacts like 'on 5001'
@@ -354,21 +382,10 @@ class ValidationService:
         return None
     
     def validate_yes_no(self, speech_text):
-        """Validate yes/no response"""
-        text = speech_text.lower().strip()
-        
-        yes_keywords = ['yes', 'yeah', 'yep', 'yup', 'ya', 'sure', 'okay', 'ok', 'correct', 'right', 'affirmative']
-        no_keywords = ['no', 'nope', 'nah', 'not', 'incorrect', 'wrong', 'negative']
-        
-        for keyword in yes_keywords:
-            if keyword in text:
-                return 'yes'
-        
-        for keyword in no_keywords:
-            if keyword in text:
-                return 'no'
-        
-        return None
+        """Validate yes/no response.
+        The first yes/no word spoken decides, so "not right" and "no, that's right" are a no.
+        """
+        return _yes_no_answer(speech_text.lower())
 
     def validate_zip(self, speech_text):
         """Extract and validate a US ZIP code from speech.
@@ -425,24 +442,13 @@ class ValidationService:
         """Parse stairs/elevator information from speech"""
         text = speech_text.lower().strip()
         
-        # Keywords indicating stairs or elevator
-        stairs_keywords = ['stair', 'stairs', 'step', 'steps', 'floor', 'level']
-        elevator_keywords = ['elevator', 'lift', 'elevators']
-        no_stairs_keywords = ['no stairs', 'no step', 'ground floor', 'first floor', 'main floor', 'flat']
-        
         # Check for explicit "no stairs"
-        for keyword in no_stairs_keywords:
-            if keyword in text:
-                return False
+        if self._no_stairs_regex.search(text):
+            return False
         
         # Check for stairs or elevator (both indicate vertical movement)
-        for keyword in stairs_keywords:
-            if keyword in text:
-                return True
-        
-        for keyword in elevator_keywords:
-            if keyword in text:
-                return True
+        if self._stairs_regex.search(text):
+            return True
         
         # Default to False if unclear
         return False
\ No newline at end of file
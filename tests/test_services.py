@@ -6,6 +6,10 @@ import unittest
 from datetime import datetime, timedelta
 from services.validation_service import ValidationService
 from services.pricing_service import PricingService
+from twilio.twiml.voice_response import VoiceResponse, Gather
+from utils import twiml
+from services.batch_writer import BatchWriter
+from utils.call_futures import CallFutures
 
 class TestValidationService(unittest.TestCase):
     def setUp(self):
@@ -96,6 +100,18 @@ class TestValidationService(unittest.TestCase):
         
         for text in no_inputs:
             self.assertEqual(self.validator.validate_yes_no(text), 'no')
+    
+    def test_validate_yes_no_whole_words(self):
+        """Yes/no words inside other words don't count"""
+        self.assertIsNone(self.validator.validate_yes_no("yesterday"))
+        self.assertIsNone(self.validator.validate_yes_no("it was corrected"))
+        self.assertEqual(self.validator.validate_yes_no("alright"), 'yes')
+        self.assertEqual(self.validator.validate_yes_no("that's incorrect"), 'no')
+        self.assertEqual(self.validator.validate_yes_no("that's not right"), 'no')
+        self.assertEqual(self.validator.validate_yes_no("Yes, that's right."), 'yes')
+        self.assertEqual(self.validator.validate_yes_no("none"), 'no')
+        self.assertEqual(self.validator.validate_yes_no("Nothing, thanks."), 'no')
+        self.assertEqual(self.validator.validate_yes_no("no, that's right"), 'no')
 
 
 class TestPricingService(unittest.TestCase):
@@ -142,6 +158,72 @@ class TestPricingService(unittest.TestCase):
         self.assertEqual(movers, 3)
 
 
+class TestTwimlTemplates(unittest.TestCase):
+    def test_cached_gather_matches_twilio_output(self):
+        """Template substitution renders the same XML as building the verbs"""
+        message = 'Tom & "Jerry" <said> yes'
+        template = twiml.gather_template(Gather(input='speech dtmf', timeout=5, finishOnKey='0'))
+        
+        for prefix in (None, 'Hello.'):
+            expected = VoiceResponse()
+            actual = VoiceResponse()
+            if prefix:
+                expected.say(prefix)
+                actual.say(prefix)
+            gather = Gather(input='speech dtmf', timeout=5, finishOnKey='0')
+            gather.say(message, voice='Polly.Joanna')
+            expected.append(gather)
+            
+            self.assertEqual(twiml.append_xml(actual, twiml.fill_gather(template, message)), str(expected))
+
+    def test_fragment_splices_like_appended_verbs(self):
+        """A pre-rendered fragment appended to a response matches appending the verbs"""
+        fallback = VoiceResponse()
+        fallback.say("I didn't catch that.", voice='Polly.Joanna')
+        fallback.redirect('/voice/process', method='POST')
+        
+        expected = VoiceResponse()
+        expected.say('Hello.')
+        expected.say("I didn't catch that.", voice='Polly.Joanna')
+        expected.redirect('/voice/process', method='POST')
+        actual = VoiceResponse()
+        actual.say('Hello.')
+        
+        self.assertEqual(twiml.append_xml(actual, twiml.fragment_xml(fallback)), str(expected))
+
+
+class TestBatchWriter(unittest.TestCase):
+    def test_batches_and_drops_oldest_when_full(self):
+        """Queued items flush together; a full queue gives up its oldest item"""
+        batches = []
+        writer = BatchWriter('test-writer', batches.append, batch_size=10, wait_seconds=0.05, maxsize=2)
+        writer._ensure_thread = lambda: None  # keep items queued until close()
+        
+        self.assertIsNone(writer.submit('a'))
+        self.assertIsNone(writer.submit('b'))
+        self.assertEqual(writer.submit('c'), 'a')
+        
+        writer.close()
+        self.assertEqual(batches, [['b', 'c']])
+
+
+class TestCallFutures(unittest.TestCase):
+    def test_expires_and_caps_entries(self):
+        """Uncollected entries expire, and the oldest call goes first at the cap"""
+        futures = CallFutures(ttl=60, maxsize=2)
+        futures.put('CA1', 'one')
+        futures.put('CA2', 'two')
+        futures.put('CA3', 'three')
+        
+        self.assertIsNone(futures.get('CA1'))
+        self.assertEqual(futures.pop('CA3'), 'three')
+        self.assertEqual(len(futures), 1)
+        
+        futures.ttl = -1
+        futures.put('CA4', 'four')
+        self.assertIsNone(futures.pop('CA4'))
+
+
 class TestConversationFlow(unittest.TestCase):
     """Test conversation flow logic"""
     
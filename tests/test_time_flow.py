@@ -6,18 +6,19 @@ import handlers.conversation_handlers as conv
 class TestTimeCollectionFlow(unittest.TestCase):
     def setUp(self):
         # Fresh sessions per test
-        conv.call_sessions = {}
+        for call_sid in ('TEST-CALL-1', 'TEST-CALL-2', 'TEST-CALL-3'):
+            conv.session_store.delete(call_sid)
 
     def test_handle_time_returns_keepalive_and_redirect(self):
         call_sid = 'TEST-CALL-1'
         # Minimal session with required data keys
-        conv.call_sessions[call_sid] = {
+        conv.session_store.set(call_sid, {
             'data': {
                 'pickup_address': 'A',
                 'dropoff_address': 'B',
                 'move_date': '2025-10-24'
             }
-        }
+        })
         resp = VoiceResponse()
         # Run within a Flask request context to allow request.url_root usage
         with app.test_request_context('/voice/process'):
@@ -25,9 +26,25 @@ class TestTimeCollectionFlow(unittest.TestCase):
         # Should include keep-alive prompt and either a Redirect or fallback gather
         self.assertIn('Please hold', twiml)
 
+    def test_handle_time_with_known_drive_time_skips_redirects(self):
+        call_sid = 'TEST-CALL-3'
+        conv.session_store.set(call_sid, {
+            'data': {
+                'pickup_address': 'A',
+                'dropoff_address': 'B',
+                'p2d_duration_minutes': 0
+            }
+        })
+        resp = VoiceResponse()
+        with app.test_request_context('/voice/process'):
+            twiml = conv.handle_time(call_sid, 'morning', resp)
+        # Availability is checked in the same turn: no keep-alive hop
+        self.assertNotIn('Please hold', twiml)
+        self.assertIn('packing service', twiml.lower())
+
     def test_continue_availability_check_without_date_goes_to_packing(self):
         call_sid = 'TEST-CALL-2'
-        conv.call_sessions[call_sid] = {
+        conv.session_store.set(call_sid, {
             'data': {
                 'pickup_address': 'A',
                 'dropoff_address': 'B',
@@ -36,7 +53,7 @@ class TestTimeCollectionFlow(unittest.TestCase):
                 'dropoff_rooms': 2,
                 'p2d_duration_minutes': 0
             }
-        }
+        })
         resp = VoiceResponse()
         twiml = conv.continue_availability_check(call_sid, resp)
         # Should prompt for packing since no date means we skip availability
@@ -0,0 +1,47 @@
+# Per-call background work, started on one webhook and collected on a later one
+import threading
+import time
+
+
+class CallFutures:
+    """{call_sid: value} that forgets entries after `ttl` seconds and holds at most `maxsize`.
+
+    The webhook that collects an entry (or the status callback that discards
+    it) may be served by another worker, or never come, so entries can't rely
+    on being popped. Expired entries are swept when the cap is reached, then
+    the oldest call goes first, like the in-process session fallback.
+    """
+    def __init__(self, ttl, maxsize=1000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items = {}  # { call_sid: (expires_at, value) }
+        self._lock = threading.Lock()
+
+    def put(self, call_sid, value):
+        with self._lock:
+            self._items.pop(call_sid, None)  # re-insert as the newest
+            if len(self._items) >= self.maxsize:
+                now = time.monotonic()
+                for key in [k for k, (expires, _) in self._items.items() if expires < now]:
+                    del self._items[key]
+                if len(self._items) >= self.maxsize:
+                    self._items.pop(next(iter(self._items)), None)
+            self._items[call_sid] = (time.monotonic() + self.ttl, value)
+
+    def get(self, call_sid):
+        """The call's live value, else None"""
+        entry = self._items.get(call_sid)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def pop(self, call_sid):
+        """Remove the call's entry; its value if it hadn't expired, else None"""
+        with self._lock:
+            entry = self._items.pop(call_sid, None)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,18 @@
+# Flask JSON provider backed by orjson (jsonify, request.json)
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize with orjson; objects it can't handle fall back to Flask's default hook"""
+    def dumps(self, obj, **kwargs):
+        # response() passes sort_keys/indent from the provider's settings
+        option = 0
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
@@ -10,9 +10,12 @@ def setup_logger(name='usf_moving', log_file=None):
     if not os.path.exists('logs'):
         os.makedirs('logs')
     
-    # Create logger
+    # Create logger (LOG_LEVEL=WARNING silences the per-turn INFO lines)
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
     # Prevent duplicate logs if handlers already exist
     if logger.handlers:
         return logger
@@ -34,12 +37,12 @@ def setup_logger(name='usf_moving', log_file=None):
         log_file = f"logs/usf_moving_{datetime.now().strftime('%Y%m%d')}.log"
     
     file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(level)
     file_handler.setFormatter(detailed_formatter)
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(level)
     console_handler.setFormatter(simple_formatter)
     
     # Add handlers
@@ -0,0 +1,72 @@
+# Pre-rendered TwiML fragments for the per-turn hot path
+import functools
+from xml.sax.saxutils import escape
+from flask import Response
+
+VOICE = 'Polly.Joanna'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+SAY_MARKER = '__SAY__'
+
+
+def say_xml(message, voice=VOICE):
+    """Render a <Say> element (same escaping as twilio's ElementTree output)"""
+    if not message:
+        return f'<Say voice="{voice}" />'
+    return f'<Say voice="{voice}">{escape(message)}</Say>'
+
+
+def play_xml(url):
+    """Render a <Play> element for a hosted recording"""
+    return f'<Play>{escape(url)}</Play>'
+
+
+def gather_template(gather):
+    """Render an empty Gather once, split where the prompt goes: (head, tail)"""
+    gather.nest(SAY_MARKER)
+    head, _, tail = gather.to_xml(xml_declaration=False).partition(SAY_MARKER)
+    return head, tail
+
+
+def fill_gather(template, message, voice=VOICE):
+    """Put the spoken prompt between a cached Gather template's head and tail"""
+    head, tail = template
+    return f'{head}{say_xml(message, voice)}{tail}'
+
+
+def fragment_xml(response):
+    """Render a response's verbs once as a bare fragment to splice into other replies"""
+    xml = response.to_xml(xml_declaration=False)
+    return xml[len('<Response>'):-len('</Response>')]
+
+
+def append_xml(response, fragment):
+    """Return the response's TwiML with a pre-rendered fragment appended.
+
+    The common case (nothing added to the response yet) skips the
+    ElementTree serialization entirely.
+    """
+    if not response.verbs:
+        return f'{XML_DECLARATION}<Response>{fragment}</Response>'
+    xml = response.to_xml()
+    return f'{xml[:-len("</Response>")]}{fragment}</Response>'
+
+
+def static_xml(response):
+    """Serialize a reply that never varies, once, to the bytes sent on the wire"""
+    return str(response).encode('utf-8')
+
+
+def xml_response(body):
+    """Wrap rendered TwiML as an application/xml response (encoded once)"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return Response(body, mimetype='application/xml')
+
+
+def xml_view(view):
+    """Route decorator: send a view's TwiML string with an XML content type"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        rv = view(*args, **kwargs)
+        return xml_response(rv) if isinstance(rv, (str, bytes)) else rv
+    return wrapper